@@ -9,6 +9,7 @@ Usos:
   # 2) Modo direto (sem menu)
   # T01 – Interpolação
   python index.py --trabalho 1 --imagem data/flor.png --metodo bilinear --escala 2.0
+  python index.py --trabalho 1 --imagem data/flor.png --metodo lanczos3 --escala 0.5
 
   # T02 – Rotulação
   python index.py --trabalho 2 --imagem data/manchas.png --thresh 127 --conectividade 4
@@ -46,7 +47,7 @@ def main():
 
     # ---- Parâmetros T01 ----
     parser.add_argument("--imagem", help="Caminho da imagem (T01/T02)")
-    parser.add_argument("--metodo", help="vizinho | bilinear (T01)")
+    parser.add_argument("--metodo", help="vizinho | bilinear | area | bicubic | lanczos3 (T01)")
     parser.add_argument("--escala", type=float, help=">1 amplia; <1 reduz (T01)")
 
     # ---- Parâmetros T02 ----
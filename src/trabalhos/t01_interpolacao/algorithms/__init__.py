@@ -1,4 +1,17 @@
 from .nearest import resize_nearest
 from .bilinear import resize_bilinear
+from .area import resize_area
+from .polyphase import resize_bicubic, resize_lanczos3
+from .pyramid import build_pyramid
+from .tiled import resize_tiled
+from ._engine import sample_bilinear
+from ._cache import get_tables, set_table_cache_size, clear_table_cache, table_cache_info
+from ._lru import LRUCache
+from ._base import round_u8
 
-__all__ = ["resize_nearest", "resize_bilinear"]
+__all__ = [
+    "resize_nearest", "resize_bilinear", "resize_area", "resize_bicubic", "resize_lanczos3",
+    "build_pyramid", "resize_tiled", "sample_bilinear",
+    "get_tables", "set_table_cache_size", "clear_table_cache", "table_cache_info",
+    "LRUCache", "round_u8",
+]
@@ -1,6 +1,14 @@
 from __future__ import annotations
 import numpy as np
 
+# Backends disponíveis para os métodos com laço de referência.
+BACKENDS = ("vectorized", "reference")
+
+# Tipo em que o laço de referência faz a mistura bilinear: peso (float do
+# Python) * pixel (np.float32). Replicar a mesma promoção garante que o
+# backend vetorizado reproduza o de referência bit a bit.
+BLEND_DTYPE = (np.float32(1) * 1.0).dtype
+
 def ensure_gray(img: np.ndarray) -> np.ndarray:
     """
     Garante imagem em tons de cinza (float32).
@@ -10,6 +18,43 @@ def ensure_gray(img: np.ndarray) -> np.ndarray:
         img = img.mean(axis=2)
     return img.astype(np.float32, copy=False)
 
+def prepare_source(img: np.ndarray, keep_channels: bool = False) -> np.ndarray:
+    """
+    Prepara a origem para o backend vetorizado sem cópia float de tamanho cheio.
+    - (H,W,C) com keep_channels=True: mantém canais e dtype originais;
+    - (H,W,C) com keep_channels=False: média dos canais (ensure_gray), como antes;
+    - (H,W): mantém o dtype original (a conversão para float é feita depois da coleta).
+    """
+    if img.ndim == 3 and not keep_channels:
+        return ensure_gray(img)
+    return img
+
+def to_float_source(img: np.ndarray, keep_channels: bool = False) -> np.ndarray:
+    """Versão float32 da origem usada pelo laço de referência."""
+    if img.ndim == 3 and keep_channels:
+        return img.astype(np.float32, copy=False)
+    return ensure_gray(img)
+
 def clamp_u8(arr: np.ndarray) -> np.ndarray:
     """Recorta para [0,255] e retorna uint8."""
     return np.clip(arr, 0, 255).astype(np.uint8)
+
+def round_u8(arr: np.ndarray) -> np.ndarray:
+    """Arredonda (meio para cima), recorta para [0,255] e retorna uint8."""
+    return clamp_u8(np.floor(arr + 0.5))
+
+def check_backend(backend: str) -> str:
+    """Valida o nome do backend ('vectorized' ou 'reference')."""
+    backend = (backend or "vectorized").strip().lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend inválido: {backend!r}. Use 'vectorized' ou 'reference'.")
+    return backend
+
+def gathered_u8(arr: np.ndarray) -> np.ndarray:
+    """
+    Resultado de uma coleta (gather) em uint8: se a origem já era uint8 não há
+    nada a recortar; senão passa por float32 + clamp_u8, como o laço de referência.
+    """
+    if arr.dtype == np.uint8:
+        return arr
+    return clamp_u8(arr.astype(np.float32, copy=False))
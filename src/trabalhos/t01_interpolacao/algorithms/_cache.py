@@ -0,0 +1,49 @@
+"""
+Cache LRU das tabelas de reamostragem, chaveado pela geometria.
+
+Em lotes de quadros do mesmo tamanho para o mesmo destino, as tabelas
+(índices + pesos de cada eixo) são calculadas uma única vez e reaproveitadas.
+A chave é (h, w, new_h, new_w, method); as tabelas guardadas são somente leitura.
+"""
+
+from __future__ import annotations
+
+from ._lru import LRUCache
+from ._tables import axis_table
+
+_DEFAULT_MAXSIZE = 32
+
+_cache = LRUCache(_DEFAULT_MAXSIZE)
+
+
+def _freeze(table):
+    """Marca os arrays da tabela como somente leitura (são compartilhados)."""
+    arrays = table if isinstance(table, tuple) else (table,)
+    for arr in arrays:
+        arr.setflags(write=False)
+    return table
+
+
+def get_tables(h: int, w: int, new_h: int, new_w: int, method: str):
+    """
+    Tabelas (linhas, colunas) para redimensionar (h,w) -> (new_h,new_w) com `method`.
+    Usa o cache quando possível; em caso de falta, calcula e guarda (LRU).
+    """
+    key = (int(h), int(w), int(new_h), int(new_w), method)
+    return _cache.get(key, lambda: (_freeze(axis_table(method, h, new_h)),
+                                    _freeze(axis_table(method, w, new_w))))
+
+
+def set_table_cache_size(maxsize: int) -> None:
+    """Define quantas geometrias o cache guarda (0 desliga o cache)."""
+    _cache.set_maxsize(maxsize)
+
+
+def clear_table_cache() -> None:
+    """Esvazia o cache e zera os contadores."""
+    _cache.clear()
+
+
+def table_cache_info() -> dict:
+    """Métricas do cache: hits, misses, evictions, size, maxsize e bytes ocupados."""
+    return _cache.info()
@@ -0,0 +1,82 @@
+"""
+LRU pequeno e thread-safe, com contadores, usado pelos caches de tabelas (T01)
+e de operandos redimensionados (T03).
+
+O valor é calculado fora da trava: duas threads podem calcular a mesma chave
+ao mesmo tempo, mas nenhuma espera pelo cálculo da outra.
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Hashable
+import numpy as np
+
+
+def _nbytes(value) -> int:
+    """Bytes dos arrays contidos em value (array ou tuplas aninhadas de arrays)."""
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(v) for v in value)
+    return int(np.asarray(value).nbytes)
+
+
+class LRUCache:
+    """Cache LRU de tamanho máximo `maxsize` (0 desliga o cache)."""
+
+    def __init__(self, maxsize: int):
+        self._lock = Lock()
+        self._entries: OrderedDict = OrderedDict()
+        self._maxsize = int(maxsize)
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _evict_excess(self) -> None:
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def get(self, key: Hashable, compute: Callable[[], object]):
+        """Valor de `key`; em caso de falta, chama compute() e guarda o resultado."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return value
+            self._misses += 1
+
+        value = compute()
+
+        with self._lock:
+            if self._maxsize > 0:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                self._evict_excess()
+        return value
+
+    def set_maxsize(self, maxsize: int) -> None:
+        """Define quantas entradas o cache guarda (0 desliga o cache)."""
+        if maxsize < 0:
+            raise ValueError("maxsize deve ser >= 0.")
+        with self._lock:
+            self._maxsize = int(maxsize)
+            self._evict_excess()
+
+    def clear(self) -> None:
+        """Esvazia o cache e zera os contadores."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def info(self) -> dict:
+        """Métricas do cache: hits, misses, evictions, size, maxsize e bytes ocupados."""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "size": len(self._entries),
+                "maxsize": self._maxsize,
+                "nbytes": sum(_nbytes(v) for v in self._entries.values()),
+            }
@@ -0,0 +1,141 @@
+"""
+Tabelas de reamostragem por eixo (índices de origem + pesos).
+
+Cada tabela descreve, para um eixo, de onde vem cada posição de saída.
+Elas são calculadas uma vez por tamanho de saída e reaproveitadas por
+todas as linhas/colunas, em vez de recalcular coordenadas pixel a pixel.
+"""
+
+from __future__ import annotations
+import numpy as np
+
+from ._base import BLEND_DTYPE
+
+
+def nearest_index(n_src: int, n_dst: int) -> np.ndarray:
+    """
+    Índices de origem do Vizinho Mais Próximo para um eixo.
+    Mesmo mapeamento do laço: round(i * n_src / n_dst), limitado a n_src-1.
+    """
+    scale = n_src / n_dst
+    # np.rint arredonda metade para o par, igual ao round() do Python
+    idx = np.rint(np.arange(n_dst) * scale).astype(np.intp)
+    np.minimum(idx, n_src - 1, out=idx)
+    return idx
+
+
+def bilinear_taps(n_src: int, n_dst: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Tabela bilinear de um eixo: (idx, pesos), ambos com forma (n_dst, 2).
+    Mapeia bordas -> bordas, como o laço de referência:
+      src = i * (n_src-1)/(n_dst-1);  idx = [floor(src), min(floor+1, n_src-1)]
+      pesos = [1 - frac, frac]
+    """
+    scale = (n_src - 1) / (n_dst - 1) if n_dst > 1 else 0.0
+    src = np.arange(n_dst) * scale
+    i0 = np.floor(src)
+    frac = src - i0
+
+    idx = np.empty((n_dst, 2), dtype=np.intp)
+    idx[:, 0] = i0
+    idx[:, 1] = np.minimum(idx[:, 0] + 1, n_src - 1)
+
+    wts = np.empty((n_dst, 2), dtype=BLEND_DTYPE)
+    wts[:, 0] = 1 - frac
+    wts[:, 1] = frac
+    return idx, wts
+
+
+def area_taps(n_src: int, n_dst: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Tabela de média por área de um eixo: (idx, pesos) com forma (n_dst, T).
+    A saída i cobre o intervalo [i*s, (i+1)*s) da origem (s = n_src/n_dst);
+    cada pixel de origem pesa pela fração do intervalo que ele ocupa.
+    Serve para qualquer fator de redução (inteiro ou não).
+    """
+    s = n_src / n_dst
+    a = np.arange(n_dst) * s
+    b = a + s
+    taps = int(np.ceil(s)) + 1
+    ks = np.floor(a)[:, None] + np.arange(taps)
+    wts = np.clip(np.minimum(ks + 1, b[:, None]) - np.maximum(ks, a[:, None]), 0.0, None) / s
+
+    # descarta colunas de taps sem peso (ex.: fatores inteiros)
+    used = wts.any(axis=0)
+    ks, wts = ks[:, used], wts[:, used]
+
+    idx = np.minimum(ks, n_src - 1).astype(np.intp)
+    return idx, wts.astype(np.float32)
+
+
+def _cubic_kernel(x: np.ndarray, a: float = -0.5) -> np.ndarray:
+    """Kernel cúbico de Keys (a = -0.5), suporte 2."""
+    x = np.abs(x)
+    x2, x3 = x * x, x * x * x
+    return np.where(
+        x <= 1.0,
+        (a + 2.0) * x3 - (a + 3.0) * x2 + 1.0,
+        np.where(x < 2.0, a * x3 - 5.0 * a * x2 + 8.0 * a * x - 4.0 * a, 0.0),
+    )
+
+
+def _lanczos3_kernel(x: np.ndarray) -> np.ndarray:
+    """Kernel de Lanczos com 3 lóbulos: sinc(x) * sinc(x/3), suporte 3."""
+    return np.where(np.abs(x) < 3.0, np.sinc(x) * np.sinc(x / 3.0), 0.0)
+
+
+def _polyphase_taps(n_src: int, n_dst: int, kernel, support: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Tabela (idx, pesos) de um kernel contínuo usando um banco polifásico.
+
+    Centros de pixel alinhados ((i + 0.5) * s - 0.5). Na redução o kernel é
+    alargado pelo fator s (anti-serrilhado). Os pesos dependem só da fase
+    (posição fracionária do centro), então são calculados uma vez por fase
+    distinta -- poucas fases quando a razão é racional -- e depois espalhados
+    para todas as posições de saída. Bordas replicam o pixel extremo.
+    """
+    scale = n_src / n_dst
+    stretch = max(scale, 1.0)
+    radius = support * stretch
+    taps = int(np.ceil(2.0 * radius))
+
+    center = (np.arange(n_dst) + 0.5) * scale - 0.5
+    first = np.floor(center - radius).astype(np.intp) + 1
+    phase = np.round(center - first, 9)
+
+    phases, which = np.unique(phase, return_inverse=True)
+    bank = kernel((phases[:, None] - np.arange(taps)) / stretch)
+    bank /= bank.sum(axis=1, keepdims=True)
+
+    idx = np.clip(first[:, None] + np.arange(taps), 0, n_src - 1)
+    return idx.astype(np.intp), bank[which.ravel()].astype(np.float32)
+
+
+def bicubic_taps(n_src: int, n_dst: int) -> tuple[np.ndarray, np.ndarray]:
+    """Tabela bicúbica (Keys, a=-0.5) de um eixo."""
+    return _polyphase_taps(n_src, n_dst, _cubic_kernel, 2.0)
+
+
+def lanczos3_taps(n_src: int, n_dst: int) -> tuple[np.ndarray, np.ndarray]:
+    """Tabela Lanczos-3 de um eixo."""
+    return _polyphase_taps(n_src, n_dst, _lanczos3_kernel, 3.0)
+
+
+# Métodos com tabela por eixo (nome -> construtor). O vizinho mais próximo usa
+# apenas índices; os demais usam taps (idx, pesos).
+AXIS_TABLES = {
+    "nearest": nearest_index,
+    "bilinear": bilinear_taps,
+    "area": area_taps,
+    "bicubic": bicubic_taps,
+    "lanczos3": lanczos3_taps,
+}
+
+
+def axis_table(method: str, n_src: int, n_dst: int):
+    """Tabela de um eixo para o método pedido."""
+    try:
+        build = AXIS_TABLES[method]
+    except KeyError:
+        raise ValueError(f"Método sem tabela por eixo: {method!r}. Use um de {sorted(AXIS_TABLES)}.")
+    return build(n_src, n_dst)
@@ -0,0 +1,21 @@
+from __future__ import annotations
+import numpy as np
+from ._base import prepare_source, round_u8
+from ._cache import get_tables
+from ._engine import separable
+
+def resize_area(img: np.ndarray, new_h: int, new_w: int, keep_channels: bool = False) -> np.ndarray:
+    """
+    Redimensiona por média de área (box filter com cobertura fracionária).
+    Indicado para reduções: cada pixel de saída é a média dos pixels de origem
+    que ele cobre, sem o serrilhado do vizinho mais próximo.
+    img: (H,W) ou (H,W,C)  (keep_channels como em resize_bilinear)
+    retorna: (new_h, new_w) ou (new_h, new_w, C) uint8
+    """
+    h, w = img.shape[:2]
+    new_h = max(1, int(new_h))
+    new_w = max(1, int(new_w))
+
+    ytab, xtab = get_tables(h, w, new_h, new_w, "area")
+    out = separable(prepare_source(img, keep_channels), ytab, xtab)
+    return round_u8(out)
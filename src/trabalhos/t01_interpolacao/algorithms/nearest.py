@@ -1,20 +1,35 @@
 from __future__ import annotations
 import numpy as np
-from ._base import ensure_gray, clamp_u8
+from ._base import prepare_source, to_float_source, clamp_u8, gathered_u8, check_backend
+from ._engine import gather_nearest
+from ._cache import get_tables
 
-def resize_nearest(img: np.ndarray, new_h: int, new_w: int) -> np.ndarray:
+def resize_nearest(img: np.ndarray, new_h: int, new_w: int, backend: str = "vectorized",
+                   keep_channels: bool = False) -> np.ndarray:
     """
     Redimensiona usando Vizinho Mais Próximo.
-    img: (H,W) ou (H,W,3)
-    retorna: (new_h, new_w) uint8
+    img: (H,W) ou (H,W,C)
+    keep_channels: se True, reamostra todos os canais de (H,W,C) em uma única passada
+                   (mesmas tabelas); se False, (H,W,C) vira cinza pela média (comportamento original)
+    backend: 'vectorized' (tabelas de índices + gather) ou 'reference' (laço pixel a pixel)
+    retorna: (new_h, new_w) ou (new_h, new_w, C) uint8
     """
-    img = ensure_gray(img)
+    backend = check_backend(backend)
     h, w = img.shape[:2]
 
     new_h = max(1, int(new_h))
     new_w = max(1, int(new_w))
 
-    out = np.empty((new_h, new_w), dtype=np.float32)
+    if backend == "reference":
+        return _resize_nearest_reference(to_float_source(img, keep_channels), h, w, new_h, new_w)
+
+    src = prepare_source(img, keep_channels)
+    rows, cols = get_tables(h, w, new_h, new_w, "nearest")
+    out = gather_nearest(src, rows, cols)
+    return gathered_u8(out)
+
+def _resize_nearest_reference(img: np.ndarray, h: int, w: int, new_h: int, new_w: int) -> np.ndarray:
+    out = np.empty((new_h, new_w) + img.shape[2:], dtype=np.float32)
 
     row_scale = h / new_h
     col_scale = w / new_w
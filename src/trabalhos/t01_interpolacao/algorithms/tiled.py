@@ -0,0 +1,58 @@
+"""
+Redimensionamento em faixas (tiles de linhas) com memória limitada.
+
+A origem pode ser qualquer objeto fatiável por linhas (ndarray, np.memmap de
+um .npy ou arquivo bruto). Para cada faixa de linhas de saída só as linhas de
+origem necessárias são lidas, e a faixa pronta é escrita direto em `out`
+(que também pode ser um memmap). As tabelas por eixo são as mesmas da versão
+sem faixas, então o resultado nas emendas é idêntico ao redimensionamento inteiro.
+"""
+
+from __future__ import annotations
+import numpy as np
+
+from ._base import prepare_source, clamp_u8, round_u8, gathered_u8
+from ._engine import gather_nearest, separable
+from ._cache import get_tables
+
+
+def resize_tiled(src, new_h: int, new_w: int, method: str = "bilinear",
+                 tile_rows: int = 256, out: np.ndarray | None = None,
+                 keep_channels: bool = False) -> np.ndarray:
+    """
+    Redimensiona `src` faixa a faixa.
+    - method: 'nearest', 'bilinear', 'area', 'bicubic' ou 'lanczos3'
+    - tile_rows: linhas de saída por faixa (o pico de memória é proporcional a isso)
+    - out: destino (new_h, new_w[, C]) uint8; se None, é alocado em memória
+    - keep_channels: mesmo significado de resize_bilinear/resize_nearest
+    Retorna `out`.
+    """
+    h, w = src.shape[:2]
+    new_h = max(1, int(new_h))
+    new_w = max(1, int(new_w))
+    tile_rows = max(1, int(tile_rows))
+
+    channels = src.shape[2:] if (len(src.shape) == 3 and keep_channels) else ()
+    if out is None:
+        out = np.empty((new_h, new_w) + channels, dtype=np.uint8)
+    elif out.shape != (new_h, new_w) + channels:
+        raise ValueError(f"'out' deve ter forma {(new_h, new_w) + channels}, recebeu {out.shape}.")
+
+    ytab, xtab = get_tables(h, w, new_h, new_w, method)
+    # o bilinear trunca (como o laço original); os demais métodos arredondam
+    finish = clamp_u8 if method == "bilinear" else round_u8
+
+    for r0 in range(0, new_h, tile_rows):
+        r1 = min(r0 + tile_rows, new_h)
+        if method == "nearest":
+            ridx = ytab[r0:r1]
+            lo, hi = int(ridx.min()), int(ridx.max())
+            strip = prepare_source(np.asarray(src[lo:hi + 1]), keep_channels)
+            out[r0:r1] = gathered_u8(gather_nearest(strip, ridx - lo, xtab))
+        else:
+            yidx, ywts = ytab[0][r0:r1], ytab[1][r0:r1]
+            lo, hi = int(yidx.min()), int(yidx.max())
+            strip = prepare_source(np.asarray(src[lo:hi + 1]), keep_channels)
+            out[r0:r1] = finish(separable(strip, (yidx - lo, ywts), xtab))
+
+    return out
@@ -6,25 +6,95 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Union
 import numpy as np
+from numpy.lib.format import open_memmap
 from PIL import Image
 
 
-def load_image(path: Union[str, Path]) -> np.ndarray:
+def load_image(path: Union[str, Path], mode: str | None = "L") -> np.ndarray:
     """
-    Carrega uma imagem do disco e retorna ndarray (grayscale).
+    Carrega uma imagem do disco e retorna ndarray.
+    mode: modo PIL de destino ('L' = tons de cinza, padrão). Com mode=None a imagem
+          é mantida como decodificada (ex.: RGB/RGBA -> (H,W,C)); só paleta ('P') é
+          expandida para RGB/RGBA. Imagens de 16 bits ('I;16*', ou 'I' com valores
+          em 0..65535) viram uint16 sem perder precisão.
     """
     p = Path(path)
     if not p.exists():
         raise FileNotFoundError(f"Imagem não encontrada: {p}")
-    # converte para 'L' (tons de cinza)
-    img = Image.open(p).convert("L")
-    return np.array(img)
+    img = Image.open(p)
+    if mode is not None:
+        img = img.convert(mode)
+    elif img.mode == "P":
+        img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+    arr = np.array(img)
+    if mode is None and img.mode.startswith("I"):
+        arr = _as_u16(arr)
+    return arr
+
+
+def _as_u16(arr: np.ndarray) -> np.ndarray:
+    """Dados de modo 'I*' do PIL como uint16 quando cabem em 0..65535 (senão, como estão)."""
+    if arr.dtype.kind == "u" and arr.dtype.itemsize == 2:
+        return arr.astype(np.uint16, copy=False)             # 'I;16B' etc. -> ordem nativa
+    if arr.dtype.kind == "i" and arr.size and 0 <= arr.min() and arr.max() <= 65535:
+        return arr.astype(np.uint16)
+    return arr
+
+
+def load_gray(path: Union[str, Path]) -> np.ndarray:
+    """
+    Tons de cinza sem perder 16 bits, decodificando o arquivo uma única vez:
+    'L' -> uint8, 16 bits -> uint16; demais modos (cor, paleta, float...) são
+    convertidos para 'L' na própria imagem aberta.
+    """
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(f"Imagem não encontrada: {p}")
+    img = Image.open(p)
+    if img.mode.startswith("I"):
+        arr = _as_u16(np.array(img))
+        if arr.dtype == np.uint16:
+            return arr
+    elif img.mode == "L":
+        return np.array(img)
+    return np.array(img.convert("L"))
 
 
 def save_image(array: np.ndarray, path: Union[str, Path]) -> None:
     """
     Salva um ndarray (0..255) como imagem no disco.
+    Aceita vistas não contíguas (ex.: flip/rot90) como estão: a única cópia é
+    a que o PIL já faz ao serializar os dados.
+    """
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    Image.fromarray(array).save(p)
+
+
+def open_array(path: Union[str, Path], shape: tuple[int, ...] | None = None,
+               dtype=np.uint8) -> np.ndarray:
+    """
+    Abre um array grande sem carregá-lo na memória (np.memmap somente leitura).
+    - .npy: forma e dtype vêm do cabeçalho;
+    - outro arquivo (bruto): é preciso informar `shape` (H,W) ou (H,W,C) e `dtype`.
+    """
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(f"Arquivo não encontrado: {p}")
+    if p.suffix.lower() == ".npy":
+        return np.load(p, mmap_mode="r")
+    if shape is None:
+        raise ValueError("Arquivo bruto: informe a forma (H,W) ou (H,W,C).")
+    return np.memmap(p, dtype=dtype, mode="r", shape=tuple(shape))
+
+
+def create_array(path: Union[str, Path], shape: tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+    """
+    Cria um array em disco (memmap gravável) para receber a saída em faixas.
+    - .npy: grava com cabeçalho; outro sufixo: arquivo bruto.
     """
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
-    Image.fromarray(array).save(p)
\ No newline at end of file
+    if p.suffix.lower() == ".npy":
+        return open_memmap(p, mode="w+", dtype=dtype, shape=tuple(shape))
+    return np.memmap(p, dtype=dtype, mode="w+", shape=tuple(shape))
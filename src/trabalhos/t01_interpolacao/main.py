@@ -4,13 +4,40 @@ from datetime import datetime
 from pathlib import Path
 import matplotlib.pyplot as plt
 
-from .algorithms import resize_nearest, resize_bilinear
-from .io_utils import load_image, save_image
-
-
-def run(imagem: str | None = None, metodo: str | None = "bilinear", escala: float | None = 2.0) -> Path:
+from .algorithms import (
+    resize_nearest, resize_bilinear, resize_area, resize_bicubic, resize_lanczos3, resize_tiled,
+)
+from .io_utils import load_image, save_image, open_array, create_array
+
+# nome no CLI -> nome do método nas tabelas por eixo
+METODOS = {
+    "vizinho": "nearest",
+    "bilinear": "bilinear",
+    "area": "area",
+    "bicubic": "bicubic",
+    "lanczos3": "lanczos3",
+}
+
+# métodos sem laço de referência (ignoram o backend)
+RESIZERS = {"area": resize_area, "bicubic": resize_bicubic, "lanczos3": resize_lanczos3}
+
+# entradas lidas como array em disco (memmap), redimensionadas em faixas
+ARRAY_SUFFIXES = {".npy", ".raw"}
+
+
+def run(imagem: str | None = None, metodo: str | None = "bilinear", escala: float | None = 2.0,
+        backend: str = "vectorized", cor: bool = False, bloco: int | None = None,
+        forma_raw: tuple[int, ...] | None = None) -> Path:
     """
-    Executa o Trabalho 01 — Interpolação (vizinho/bilinear).
+    Executa o Trabalho 01 — Interpolação (vizinho/bilinear/area/bicubic/lanczos3).
+    metodo 'area' faz média por área (indicado para reduções); 'bicubic' e 'lanczos3'
+    usam bancos polifásicos separáveis. Esses três ignoram o backend.
+    backend: 'vectorized' (padrão) ou 'reference' (laço original, para conferência).
+    cor: se True, mantém os canais da imagem (RGB/RGBA) em vez de converter para cinza.
+    bloco: se informado, redimensiona em faixas de `bloco` linhas de saída.
+    forma_raw: forma (H,W) ou (H,W,C) de uma entrada bruta (.raw, uint8).
+    Entradas .npy/.raw são lidas via memmap e processadas em faixas, com a
+    saída gravada incrementalmente em um .npy (memória proporcional ao bloco).
     """
     if imagem is None:
         imagem = input("Caminho da imagem (ex: data/flor.png): ").strip()
@@ -19,8 +46,8 @@ def run(imagem: str | None = None, metodo: str | None = "bilinear", escala: floa
         raise ValueError("É necessário informar o caminho da imagem.")
 
     metodo = (metodo or "bilinear").strip().lower()
-    if metodo not in {"vizinho", "bilinear"}:
-        raise ValueError("Método inválido. Use 'vizinho' ou 'bilinear'.")
+    if metodo not in METODOS:
+        raise ValueError("Método inválido. Use 'vizinho', 'bilinear', 'area', 'bicubic' ou 'lanczos3'.")
 
     try:
         escala = float(escala if escala is not None else input("Escala (>1 amplia; <1 reduz) [2.0]: ") or "2.0")
@@ -30,16 +57,28 @@ def run(imagem: str | None = None, metodo: str | None = "bilinear", escala: floa
     if escala <= 0:
         raise ValueError("Escala deve ser > 0. Ex.: 0.5 (reduz), 2.0 (amplia)")
 
+    # arrays em disco (.npy/.raw) sempre usam o modo em faixas
+    array = Path(imagem).suffix.lower() in ARRAY_SUFFIXES
+    if (bloco is not None or array) and backend != "vectorized":
+        raise ValueError("O modo em faixas (bloco, ou entrada .npy/.raw) só existe no backend 'vectorized'.")
+
+    if array:
+        return _run_tiled(imagem, metodo, escala, bloco or 256, forma_raw, cor)
+
     # carrega e processa
-    img = load_image(imagem)
+    img = load_image(imagem, mode=None if cor else "L")
     h, w = img.shape[:2]
     new_h = max(1, int(round(h * escala)))
     new_w = max(1, int(round(w * escala)))
 
-    if metodo == "vizinho":
-        out = resize_nearest(img, new_h, new_w)
+    if bloco is not None:
+        out = resize_tiled(img, new_h, new_w, method=METODOS[metodo], tile_rows=bloco, keep_channels=cor)
+    elif metodo == "vizinho":
+        out = resize_nearest(img, new_h, new_w, backend=backend, keep_channels=cor)
+    elif metodo in RESIZERS:
+        out = RESIZERS[metodo](img, new_h, new_w, keep_channels=cor)
     else:
-        out = resize_bilinear(img, new_h, new_w)
+        out = resize_bilinear(img, new_h, new_w, backend=backend, keep_channels=cor)
 
     # salvar
     outputs = Path("outputs")
@@ -56,12 +95,12 @@ def run(imagem: str | None = None, metodo: str | None = "bilinear", escala: floa
     try:
         plt.figure(figsize=(8, 4))
         plt.subplot(1, 2, 1)
-        plt.imshow(img, cmap="gray")
+        plt.imshow(img, cmap=None if img.ndim == 3 else "gray")
         plt.title("Original")
         plt.axis("off")
 
         plt.subplot(1, 2, 2)
-        plt.imshow(out, cmap="gray")
+        plt.imshow(out, cmap=None if out.ndim == 3 else "gray")
         plt.title(f"Resultado: {metodo}")
         plt.axis("off")
 
@@ -73,12 +112,47 @@ def run(imagem: str | None = None, metodo: str | None = "bilinear", escala: floa
     return out_path
 
 
+def _run_tiled(imagem: str, metodo: str, escala: float, bloco: int,
+               forma_raw: tuple[int, ...] | None, cor: bool) -> Path:
+    """
+    Redimensiona um array em disco (.npy/.raw) faixa a faixa, sem carregá-lo inteiro.
+    A saída é um .npy em outputs/ gravado incrementalmente (memmap).
+    """
+    src = open_array(imagem, shape=forma_raw)
+    h, w = src.shape[:2]
+    new_h = max(1, int(round(h * escala)))
+    new_w = max(1, int(round(w * escala)))
+    channels = src.shape[2:] if (src.ndim == 3 and cor) else ()
+
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    base = Path(imagem).stem
+    out_path = Path("outputs") / f"{base}_{metodo}_esc{escala:.2f}_{ts}.npy"
+    out = create_array(out_path, (new_h, new_w) + channels)
+
+    resize_tiled(src, new_h, new_w, method=METODOS[metodo], tile_rows=bloco, out=out, keep_channels=cor)
+    out.flush()
+    del out
+
+    print(f"✅ Resultado ({new_h}x{new_w}) salvo em: {out_path}")
+    return out_path
+
+
+def _parse_forma(txt: str | None) -> tuple[int, ...] | None:
+    """'3000x4000' ou '3000x4000x3' -> tupla de inteiros."""
+    if not txt:
+        return None
+    try:
+        return tuple(int(v) for v in txt.lower().split("x"))
+    except ValueError:
+        raise ValueError("Forma inválida. Use HxW ou HxWxC (ex.: 3000x4000).")
+
+
 def questionario():
     """
     Questionário específico do Trabalho 01 (chamado pelo menu global).
     """
     imagem = input("Caminho da imagem (ex: data/flor.png): ").strip() or "data/flor.png"
-    metodo = input("Método (vizinho/bilinear) [bilinear]: ").strip().lower() or "bilinear"
+    metodo = input("Método (vizinho/bilinear/area/bicubic/lanczos3) [bilinear]: ").strip().lower() or "bilinear"
     esc_txt = input("Escala (>1 amplia, <1 reduz) [2.0]: ").strip() or "2.0"
     try:
         escala = float(esc_txt)
@@ -92,11 +166,17 @@ def questionario():
 def _cli():
     parser = argparse.ArgumentParser(description="Trabalho 01 — Interpolação (vizinho/bilinear)")
     parser.add_argument("--imagem", type=str, help="Caminho da imagem de entrada (ex.: data/flor.png)")
-    parser.add_argument("--metodo", type=str, default="bilinear", help="vizinho | bilinear")
+    parser.add_argument("--metodo", type=str, default="bilinear", help="vizinho | bilinear | area | bicubic | lanczos3")
     parser.add_argument("--escala", type=float, default=2.0, help=">1 amplia; <1 reduz (ex.: 0.5, 2.0)")
+    parser.add_argument("--backend", type=str, default="vectorized", choices=["vectorized", "reference"],
+                        help="vectorized (rápido) | reference (laço original)")
+    parser.add_argument("--cor", action="store_true", help="Mantém os canais de cor (não converte para cinza)")
+    parser.add_argument("--bloco", type=int, help="Linhas de saída por faixa (modo com memória limitada)")
+    parser.add_argument("--forma-raw", type=str, help="Forma de entrada .raw (uint8): HxW ou HxWxC")
 
     args = parser.parse_args()
-    run(imagem=args.imagem, metodo=args.metodo, escala=args.escala)
+    run(imagem=args.imagem, metodo=args.metodo, escala=args.escala, backend=args.backend, cor=args.cor,
+        bloco=args.bloco, forma_raw=_parse_forma(args.forma_raw))
 
 
 if __name__ == "__main__":
@@ -1,3 +1,10 @@
 from .labeling import connected_components
+from .packed import PackedMask, binarize_packed
+from .props import region_props, PROPS_DTYPE
+from .streaming import StreamingLabeler, label_stream
+from .sweep import threshold_sweep, SWEEP_DTYPE
 
-__all__ = ["connected_components"]
+__all__ = [
+    "connected_components", "PackedMask", "binarize_packed", "region_props", "PROPS_DTYPE",
+    "StreamingLabeler", "label_stream", "threshold_sweep", "SWEEP_DTYPE",
+]
@@ -1,93 +1,203 @@
 from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import numpy as np
 
+from .packed import PackedMask, packed_runs
+from .props import props_from_runs
+
 class UnionFind:
-    def __init__(self):
-        self.parent = {}
+    """
+    Union-find sobre um array int32 pré-alocado (um nó por corrida).
+    find é iterativo (sem risco de estourar o limite de recursão) e comprime o caminho.
+    """
+    def __init__(self, n: int):
+        self.parent = np.arange(n, dtype=np.int32)
+        # acesso elemento a elemento pelo memoryview (ints do Python, sem escalares NumPy)
+        self._p = memoryview(self.parent)
 
     def find(self, x: int) -> int:
-        # path compression
-        if self.parent.get(x, x) != x:
-            self.parent[x] = self.find(self.parent[x])
-        return self.parent.get(x, x)
+        p = self._p
+        root = x
+        while p[root] != root:
+            root = p[root]
+        # compressão de caminho
+        while p[x] != root:
+            p[x], x = root, p[x]
+        return root
 
     def union(self, a: int, b: int) -> None:
         ra, rb = self.find(a), self.find(b)
         if ra != rb:
-            # une pelo menor id para ter rótulos mais “compactos”
+            # une pelo menor id: a raiz de cada conjunto é sempre o seu menor índice
             if ra < rb:
-                self.parent[rb] = ra
+                self._p[rb] = ra
             else:
-                self.parent[ra] = rb
+                self._p[ra] = rb
+
+    def roots(self) -> np.ndarray:
+        """Raiz de todos os nós (saltos de ponteiro vetorizados até estabilizar)."""
+        parent = self.parent
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+        self.parent[:] = parent
+        return parent
+
+def find_runs(binary: np.ndarray | PackedMask) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Corridas de foreground por linha, em ordem raster.
+    Retorna (rows, starts, ends) com `ends` exclusivo: a corrida k ocupa
+    binary[rows[k], starts[k]:ends[k]]. Aceita também uma PackedMask.
+    """
+    if isinstance(binary, PackedMask):
+        return packed_runs(binary)
+    h, w = binary.shape
+    edges = np.zeros((h, w + 2), dtype=np.int8)
+    edges[:, 1:-1] = binary > 0
+    d = np.diff(edges, axis=1)             # +1 onde começa, -1 onde termina
+    rows, starts = np.nonzero(d == 1)
+    _, ends = np.nonzero(d == -1)
+    return rows, starts, ends
+
+def run_pairs(rows: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+              width: int, connectivity: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pares (a, b) de corridas vizinhas: a na linha y, b na linha y-1.
+    Para 4-conectividade os intervalos precisam se sobrepor; para 8 basta se tocarem
+    na diagonal. Busca binária sobre posições globais (linha * (W+2) + coluna).
+    """
+    n = rows.shape[0]
+    if n == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+    k = 1 if connectivity == 8 else 0
+    stride = width + 2
+    base = rows.astype(np.int64) * stride
+    gstart = base + starts
+    gend = base + ends
+
+    prev = base - stride                      # mesma coluna, uma linha acima
+    lo = np.searchsorted(gend, prev + starts - k, side="right")
+    hi = np.searchsorted(gstart, prev + ends + k, side="left")
+    counts = np.maximum(hi - lo, 0)
 
-def connected_components(binary: np.ndarray, connectivity: int = 4) -> tuple[np.ndarray, int]:
+    a = np.repeat(np.arange(n), counts)
+    offsets = np.cumsum(counts) - counts
+    b = np.repeat(lo, counts) + (np.arange(a.shape[0]) - np.repeat(offsets, counts))
+    return a, b
+
+def paint_runs(shape: tuple[int, int], rows: np.ndarray, starts: np.ndarray,
+               ends: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Pinta cada corrida com values[k] em uma imagem int32 (fundo = 0)."""
+    h, w = shape
+    out = np.zeros(h * w, dtype=np.int32)
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if total:
+        offsets = np.cumsum(lengths) - lengths
+        pos = np.repeat(rows.astype(np.int64) * w + starts, lengths)
+        pos += np.arange(total) - np.repeat(offsets, lengths)
+        out[pos] = np.repeat(values.astype(np.int32, copy=False), lengths)
+    return out.reshape(h, w)
+
+def canonical_ids(roots: np.ndarray) -> tuple[np.ndarray, int]:
     """
-    Rotulação de componentes conectadas (duas passagens) em imagem binária {0,1}.
+    Rótulo final 1..K de cada corrida a partir das raízes (raiz = menor índice).
+    Como as corridas estão em ordem raster, os componentes ficam numerados pela
+    ordem do seu primeiro pixel -- a mesma numeração da segunda passagem clássica.
+    """
+    is_root = roots == np.arange(roots.shape[0])
+    new_id = np.cumsum(is_root, dtype=np.int32)
+    K = int(new_id[-1]) if new_id.shape[0] else 0
+    return new_id[roots], K
+
+def _label_band(binary: np.ndarray | PackedMask, connectivity: int):
+    """
+    Primeira passagem sobre uma faixa de linhas: corridas + raízes no union-find.
+    Retorna (rows, starts, ends, roots); roots[k] é o menor índice do componente da corrida k.
+    """
+    rows, starts, ends = find_runs(binary)
+    uf = UnionFind(rows.shape[0])
+    a, b = run_pairs(rows, starts, ends, binary.shape[1], connectivity)
+    for ra, rb in zip(a.tolist(), b.tolist()):
+        uf.union(ra, rb)
+    return rows, starts, ends, uf.roots()
+
+def _label_parallel(binary: np.ndarray | PackedMask, connectivity: int, workers: int):
+    """
+    Rotula faixas horizontais em paralelo (pool de processos) e costura as emendas.
+    Cada faixa é rotulada de forma independente; depois só as corridas da primeira
+    linha de cada faixa e da última linha da faixa anterior passam por um
+    union-find pequeno. Retorna o mesmo (rows, starts, ends, roots) de _label_band.
+    """
+    h, w = binary.shape
+    bounds = np.unique(np.linspace(0, h, workers + 1).astype(int))
+    bands = [binary[r0:r1] for r0, r1 in zip(bounds[:-1], bounds[1:])]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(_label_band, bands, repeat(connectivity)))
+
+    # junta as faixas: linhas e raízes deslocadas para a numeração global
+    rows, starts, ends, roots = [], [], [], []
+    run_offset = 0
+    for r0, (b_rows, b_starts, b_ends, b_roots) in zip(bounds[:-1], parts):
+        rows.append(b_rows + r0)
+        starts.append(b_starts)
+        ends.append(b_ends)
+        roots.append(b_roots + run_offset)
+        run_offset += b_rows.shape[0]
+    rows, starts, ends = np.concatenate(rows), np.concatenate(starts), np.concatenate(ends)
+
+    uf = UnionFind(run_offset)
+    uf.parent[:] = np.concatenate(roots)
+
+    # costura: pares entre a última linha da faixa anterior e a primeira da seguinte
+    for y in bounds[1:-1]:
+        i0 = np.searchsorted(rows, y - 1, side="left")
+        i1 = np.searchsorted(rows, y, side="right")
+        a, b = run_pairs(rows[i0:i1], starts[i0:i1], ends[i0:i1], w, connectivity)
+        for ra, rb in zip((a + i0).tolist(), (b + i0).tolist()):
+            uf.union(ra, rb)
+    return rows, starts, ends, uf.roots()
+
+def connected_components(binary: np.ndarray | PackedMask, connectivity: int = 4, stats: bool = False,
+                         workers: int | None = None):
+    """
+    Rotulação de componentes conectadas (duas passagens) em imagem binária {0,1}
+    ou em uma PackedMask (1 bit/pixel; as corridas saem direto dos bits).
     - connectivity: 4 ou 8
+    - stats: se True, devolve também as estatísticas por componente (ver region_props),
+             acumuladas a partir das corridas, sem reler a imagem
+    - workers: se > 1, rotula faixas horizontais em paralelo (processos) e une os
+               rótulos nas emendas; o resultado é idêntico ao da versão sequencial
+    1ª passagem: rotula corridas de foreground (não pixels) e registra equivalências
+    entre corridas de linhas vizinhas no union-find.
+    2ª passagem: remapeia tudo com uma única consulta vetorizada `remap[labels]`.
     Retorna:
       labels: (H,W) int32 com rótulos {0=background, 1..K}
       K: número de componentes
+      props: (só com stats=True) array estruturado com área, caixa e centróide
     """
     assert connectivity in (4, 8), "connectivity deve ser 4 ou 8"
-    if binary.dtype != np.uint8:
-        binary = binary.astype(np.uint8)
-    # garante estritamente 0/1
-    bin01 = (binary > 0).astype(np.uint8)
-
-    h, w = bin01.shape
-    labels = np.zeros((h, w), dtype=np.int32)
-    uf = UnionFind()
-    next_label = 1
-
-    # vizinhança “r” (esquerda) e “s” (cima) conforme aula; para 8, inclui diagonais
-    # r: (y, x-1), s: (y-1, x)
-    # diagonais: (y-1, x-1) e (y-1, x+1)
-    for y in range(h):
-        for x in range(w):
-            if bin01[y, x] == 0:
-                continue
-
-            neighbors = []
-            # s (cima)
-            if y - 1 >= 0 and labels[y - 1, x] > 0:
-                neighbors.append(labels[y - 1, x])
-            # r (esquerda)
-            if x - 1 >= 0 and labels[y, x - 1] > 0:
-                neighbors.append(labels[y, x - 1])
-
-            if connectivity == 8:
-                # diag up-left
-                if y - 1 >= 0 and x - 1 >= 0 and labels[y - 1, x - 1] > 0:
-                    neighbors.append(labels[y - 1, x - 1])
-                # diag up-right
-                if y - 1 >= 0 and x + 1 < w and labels[y - 1, x + 1] > 0:
-                    neighbors.append(labels[y - 1, x + 1])
-
-            if not neighbors:
-                labels[y, x] = next_label
-                uf.parent[next_label] = next_label
-                next_label += 1
-            else:
-                # pega o menor label vizinho
-                m = min(neighbors)
-                labels[y, x] = m
-                # registra equivalências se houver mais de um label
-                for lab in neighbors:
-                    if lab != m:
-                        uf.union(m, lab)
-
-    # segunda passagem: comprime equivalências e remapeia para 1..K
-    # cria mapa de raiz->novo rótulo compacto
-    root_to_new = {}
-    new_id = 1
-    for y in range(h):
-        for x in range(w):
-            if labels[y, x] > 0:
-                root = uf.find(labels[y, x])
-                if root not in root_to_new:
-                    root_to_new[root] = new_id
-                    new_id += 1
-                labels[y, x] = root_to_new[root]
-
-    K = new_id - 1
+
+    h, w = binary.shape
+    if workers is not None and workers > 1 and h > 1:
+        rows, starts, ends, roots = _label_parallel(binary, connectivity, min(workers, h))
+    else:
+        rows, starts, ends, roots = _label_band(binary, connectivity)
+    n = rows.shape[0]
+
+    # primeira passagem: rótulo provisório = índice da corrida + 1
+    labels = paint_runs((h, w), rows, starts, ends, np.arange(1, n + 1))
+
+    # segunda passagem: provisório -> 1..K (0 continua fundo)
+    run_ids, K = canonical_ids(roots)
+    remap = np.zeros(n + 1, dtype=np.int32)
+    remap[1:] = run_ids
+    labels = remap[labels]
+    if stats:
+        return labels, K, props_from_runs(rows, starts, ends, run_ids, K)
     return labels, K
@@ -0,0 +1,71 @@
+"""
+Máscaras binárias compactadas em bits (1 bit por pixel).
+
+Formato igual ao de np.packbits(axis=1) e ao modo "1" do PIL: cada linha
+ocupa ceil(W/8) bytes, bit mais significativo primeiro, bits de
+preenchimento no fim da linha sempre 0. As corridas de foreground são
+extraídas direto das palavras compactadas, sem expandir para 1 byte/pixel.
+"""
+
+from __future__ import annotations
+import numpy as np
+
+class PackedMask:
+    """Máscara (H, W) guardada como bits (H, ceil(W/8)) uint8."""
+
+    def __init__(self, bits: np.ndarray, width: int):
+        if bits.ndim != 2 or bits.dtype != np.uint8 or bits.shape[1] != (width + 7) // 8:
+            raise ValueError("bits deve ser uint8 (H, ceil(W/8)).")
+        self.bits = bits
+        self.width = int(width)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.bits.shape[0], self.width
+
+    @classmethod
+    def from_bool(cls, mask: np.ndarray) -> "PackedMask":
+        return cls(np.packbits(mask > 0, axis=1), mask.shape[1])
+
+    def unpack(self) -> np.ndarray:
+        """Expande para uint8 {0,1} (H, W) -- só para visualização/depuração."""
+        return np.unpackbits(self.bits, axis=1, count=self.width)
+
+    def __getitem__(self, rows: slice) -> "PackedMask":
+        """Fatia por linhas (ex.: mask[r0:r1]); as colunas ficam inteiras."""
+        if not isinstance(rows, slice):
+            raise TypeError("PackedMask só aceita fatias de linhas.")
+        return PackedMask(self.bits[rows], self.width)
+
+def binarize_packed(gray: np.ndarray, thresh: int = 127, block_rows: int = 1024) -> PackedMask:
+    """
+    Binariza (foreground = gray >= thresh) gravando direto em bits.
+    Trabalha em blocos de linhas: o temporário booleano nunca passa de block_rows x W.
+    """
+    h, w = gray.shape
+    bits = np.empty((h, (w + 7) // 8), dtype=np.uint8)
+    for r0 in range(0, h, block_rows):
+        bits[r0:r0 + block_rows] = np.packbits(gray[r0:r0 + block_rows] >= thresh, axis=1)
+    return PackedMask(bits, w)
+
+def packed_runs(mask: PackedMask) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Corridas (rows, starts, ends) de uma PackedMask, em ordem raster (ends exclusivo).
+    Cada bit é comparado com o anterior (xor com a linha deslocada 1 bit); só os bytes
+    com alguma transição são expandidos para achar a posição dos bits.
+    """
+    bits = mask.bits
+    h, nb = bits.shape
+    # um byte zero extra garante a transição de fim para corridas que tocam a borda
+    padded = np.zeros((h, nb + 1), dtype=np.uint8)
+    padded[:, :nb] = bits
+
+    trans = padded >> 1
+    trans[:, 1:] |= padded[:, :-1] << 7        # último bit do byte anterior
+    np.bitwise_xor(padded, trans, out=trans)
+
+    r, c = np.nonzero(trans)
+    k, b = np.nonzero(np.unpackbits(trans[r, c][:, None], axis=1))
+    pos = c[k] * 8 + b
+    # transições alternam início/fim dentro de cada linha (toda linha termina em 0)
+    return r[k][0::2], pos[0::2], pos[1::2]
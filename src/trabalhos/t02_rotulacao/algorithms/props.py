@@ -0,0 +1,72 @@
+"""
+Estatísticas por componente (área, caixa envolvente, centróide).
+
+Tudo é acumulado com reduções vetorizadas (np.bincount / np.minimum.at /
+np.maximum.at) -- nunca uma varredura da imagem por componente.
+"""
+
+from __future__ import annotations
+import numpy as np
+
+# y1/x1 são exclusivos: o componente cabe em labels[y0:y1, x0:x1]
+PROPS_DTYPE = np.dtype([
+    ("label", np.int32),
+    ("area", np.int64),
+    ("y0", np.int32), ("x0", np.int32),
+    ("y1", np.int32), ("x1", np.int32),
+    ("cy", np.float64), ("cx", np.float64),
+])
+
+def _assemble(K: int, area, sum_y, sum_x, y0, x0, y1, x1) -> np.ndarray:
+    props = np.zeros(K, dtype=PROPS_DTYPE)
+    props["label"] = np.arange(1, K + 1)
+    props["area"] = area[1:]
+    props["y0"], props["x0"] = y0[1:], x0[1:]
+    props["y1"], props["x1"] = y1[1:], x1[1:]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        props["cy"] = sum_y[1:] / area[1:]
+        props["cx"] = sum_x[1:] / area[1:]
+    return props
+
+def _extremes(ids: np.ndarray, K: int, lo_vals, hi_vals) -> tuple[np.ndarray, np.ndarray]:
+    lo = np.full(K + 1, np.iinfo(np.int32).max, dtype=np.int64)
+    hi = np.full(K + 1, -1, dtype=np.int64)
+    np.minimum.at(lo, ids, lo_vals)
+    np.maximum.at(hi, ids, hi_vals)
+    return lo, hi
+
+def props_from_runs(rows: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                    run_ids: np.ndarray, K: int) -> np.ndarray:
+    """
+    Estatísticas a partir das corridas da rotulação (sem tocar na imagem).
+    run_ids: rótulo final (1..K) de cada corrida.
+    """
+    lengths = (ends - starts).astype(np.float64)
+    area = np.bincount(run_ids, weights=lengths, minlength=K + 1).astype(np.int64)
+    sum_y = np.bincount(run_ids, weights=lengths * rows, minlength=K + 1)
+    # soma das colunas de uma corrida [s, e): comprimento * (s + e - 1) / 2
+    sum_x = np.bincount(run_ids, weights=lengths * (starts + ends - 1) / 2.0, minlength=K + 1)
+    y0, y1 = _extremes(run_ids, K, rows, rows + 1)
+    x0, x1 = _extremes(run_ids, K, starts, ends)
+    return _assemble(K, area, sum_y, sum_x, y0, x0, y1, x1)
+
+def region_props(labels: np.ndarray, K: int | None = None) -> np.ndarray:
+    """
+    Estatísticas por componente de um mapa de rótulos {0, 1..K}, em uma passada.
+    Retorna array estruturado (PROPS_DTYPE) com uma linha por rótulo 1..K:
+      label, area, y0, x0, y1, x1 (caixa com fim exclusivo), cy, cx (centróide).
+    """
+    if K is None:
+        K = int(labels.max()) if labels.size else 0
+    w = labels.shape[1]
+    flat = labels.ravel()
+    pos = np.flatnonzero(flat)
+    ids = flat[pos]
+    ys, xs = np.divmod(pos, w)
+
+    area = np.bincount(ids, minlength=K + 1).astype(np.int64)
+    sum_y = np.bincount(ids, weights=ys, minlength=K + 1)
+    sum_x = np.bincount(ids, weights=xs, minlength=K + 1)
+    y0, y1 = _extremes(ids, K, ys, ys + 1)
+    x0, x1 = _extremes(ids, K, xs, xs + 1)
+    return _assemble(K, area, sum_y, sum_x, y0, x0, y1, x1)
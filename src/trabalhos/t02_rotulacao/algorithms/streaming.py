@@ -0,0 +1,228 @@
+"""
+Rotulação em fluxo (linha a linha) com memória de trabalho O(largura).
+
+Consome blocos de linhas de um iterador (scanner, memmap lido aos pedaços...)
+e guarda apenas as corridas da linha anterior com seus rótulos. As
+estatísticas de cada componente são emitidas assim que ele "fecha" (nenhuma
+corrida dele na linha atual). Opcionalmente o mapa de rótulos provisórios é
+gravado em um arquivo bruto int32 (H, W) para uma passada final de remapeamento.
+
+Além da largura, a memória cresce só com o número de rótulos provisórios
+(um por início de componente, não por pixel nem por corrida).
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Iterable
+import numpy as np
+
+from .labeling import find_runs
+from .packed import PackedMask
+from .props import PROPS_DTYPE
+
+class StreamingLabeler:
+    """
+    Uso:
+        lab = StreamingLabeler(width=W, connectivity=8, labels_path="rotulos.i32")
+        for bloco in blocos:              # arrays (r, W) ou linhas (W,)
+            fechados = lab.feed(bloco)    # componentes que terminaram neste bloco
+        fechados = lab.finish()           # componentes que tocam a última linha
+        lab.remap[fechados["label"]]      # rótulo provisório -> final 1..K
+        lab.relabel()                     # aplica o remapeamento no arquivo
+    Os registros emitidos usam PROPS_DTYPE com `label` = rótulo provisório.
+    """
+
+    def __init__(self, width: int, connectivity: int = 4, labels_path: str | Path | None = None):
+        assert connectivity in (4, 8), "connectivity deve ser 4 ou 8"
+        self.width = int(width)
+        self.connectivity = connectivity
+        self._k = 1 if connectivity == 8 else 0
+        self.rows_seen = 0
+
+        # corridas da linha anterior e seus rótulos provisórios
+        self._prev_starts = np.empty(0, dtype=np.intp)
+        self._prev_ends = np.empty(0, dtype=np.intp)
+        self._prev_labels: list[int] = []
+
+        # union-find + acumuladores por rótulo provisório (índice 0 = fundo, sem uso)
+        self._parent = [0]
+        self._area = [0]
+        self._y0, self._x0, self._y1, self._x1 = [0], [0], [0], [0]
+        self._sum_y, self._sum_x = [0.0], [0.0]
+
+        self.labels_path = Path(labels_path) if labels_path is not None else None
+        self._file = open(self.labels_path, "wb") if self.labels_path is not None else None
+
+        self.K: int | None = None
+        self.remap: np.ndarray | None = None
+
+    # ---------- union-find ----------
+    def _find(self, x: int) -> int:
+        p = self._parent
+        root = x
+        while p[root] != root:
+            root = p[root]
+        while p[x] != root:
+            p[x], x = root, p[x]
+        return root
+
+    def _union(self, a: int, b: int) -> int:
+        ra, rb = self._find(a), self._find(b)
+        if ra == rb:
+            return ra
+        if rb < ra:
+            ra, rb = rb, ra
+        # rb passa a apontar para ra (menor rótulo) e entrega suas estatísticas
+        self._parent[rb] = ra
+        self._area[ra] += self._area[rb]
+        self._y0[ra] = min(self._y0[ra], self._y0[rb])
+        self._x0[ra] = min(self._x0[ra], self._x0[rb])
+        self._y1[ra] = max(self._y1[ra], self._y1[rb])
+        self._x1[ra] = max(self._x1[ra], self._x1[rb])
+        self._sum_y[ra] += self._sum_y[rb]
+        self._sum_x[ra] += self._sum_x[rb]
+        return ra
+
+    def _new_label(self, y: int, s: int, e: int) -> int:
+        lab = len(self._parent)
+        self._parent.append(lab)
+        self._area.append(0)
+        self._y0.append(y); self._x0.append(s)
+        self._y1.append(y + 1); self._x1.append(e)
+        self._sum_y.append(0.0); self._sum_x.append(0.0)
+        return lab
+
+    def _accumulate(self, lab: int, y: int, s: int, e: int) -> None:
+        n = e - s
+        self._area[lab] += n
+        self._x0[lab] = min(self._x0[lab], s)
+        self._x1[lab] = max(self._x1[lab], e)
+        self._y1[lab] = max(self._y1[lab], y + 1)
+        self._sum_y[lab] += n * y
+        self._sum_x[lab] += n * (s + e - 1) / 2.0
+
+    def _records(self, roots) -> np.ndarray:
+        roots = sorted(roots)
+        rec = np.zeros(len(roots), dtype=PROPS_DTYPE)
+        for i, r in enumerate(roots):
+            area = self._area[r]
+            rec[i] = (r, area, self._y0[r], self._x0[r], self._y1[r], self._x1[r],
+                      self._sum_y[r] / area, self._sum_x[r] / area)
+        return rec
+
+    # ---------- fluxo ----------
+    def _row(self, y: int, starts: np.ndarray, ends: np.ndarray) -> set[int]:
+        """Rotula as corridas de uma linha; devolve os componentes que fecharam."""
+        k = self._k
+        lo = np.searchsorted(self._prev_ends, starts - k, side="right").tolist()
+        hi = np.searchsorted(self._prev_starts, ends + k, side="left").tolist()
+        prev_labels = self._prev_labels
+
+        labels = []
+        for s, e, i0, i1 in zip(starts.tolist(), ends.tolist(), lo, hi):
+            if i1 > i0:
+                lab = self._find(prev_labels[i0])
+                for j in range(i0 + 1, i1):
+                    lab = self._union(lab, prev_labels[j])
+            else:
+                lab = self._new_label(y, s, e)
+            self._accumulate(lab, y, s, e)
+            labels.append(lab)
+
+        if self._file is not None:
+            row = np.zeros(self.width, dtype=np.int32)
+            for s, e, lab in zip(starts.tolist(), ends.tolist(), labels):
+                row[s:e] = lab
+            self._file.write(row.tobytes())
+
+        active = {self._find(lab) for lab in labels}
+        closed = {self._find(lab) for lab in prev_labels} - active
+        self._prev_starts, self._prev_ends, self._prev_labels = starts, ends, labels
+        return closed
+
+    def feed(self, chunk: np.ndarray | PackedMask) -> np.ndarray:
+        """
+        Processa um bloco (r, W), uma linha (W,) ou uma PackedMask de r linhas;
+        retorna os componentes que fecharam.
+        """
+        if self.remap is not None:
+            raise RuntimeError("finish() já foi chamado.")
+        if not isinstance(chunk, PackedMask):
+            chunk = np.asarray(chunk)
+            if chunk.ndim == 1:
+                chunk = chunk[None, :]
+        if chunk.shape[1] != self.width:
+            raise ValueError(f"Largura do bloco ({chunk.shape[1]}) difere de width={self.width}.")
+
+        rows, starts, ends = find_runs(chunk)
+        bounds = np.searchsorted(rows, np.arange(chunk.shape[0] + 1))
+        closed: set[int] = set()
+        for r in range(chunk.shape[0]):
+            i0, i1 = bounds[r], bounds[r + 1]
+            closed |= self._row(self.rows_seen, starts[i0:i1], ends[i0:i1])
+            self.rows_seen += 1
+        return self._records(closed)
+
+    def finish(self) -> np.ndarray:
+        """
+        Encerra o fluxo: fecha os componentes restantes e calcula `K` e `remap`
+        (rótulo provisório -> final 1..K, na ordem do primeiro pixel de cada componente).
+        """
+        remaining = {self._find(lab) for lab in self._prev_labels}
+        self._prev_labels = []
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+        parent = np.asarray(self._parent, dtype=np.int32)
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+        is_root = parent == np.arange(parent.shape[0])
+        is_root[0] = False
+        new_id = np.cumsum(is_root, dtype=np.int32)
+        self.remap = new_id[parent]
+        self.remap[0] = 0
+        self.K = int(new_id[-1])
+        return self._records(remaining)
+
+    def relabel(self, block_rows: int = 1024) -> np.ndarray:
+        """Aplica `remap` ao arquivo de rótulos provisórios, em blocos; devolve o memmap final."""
+        if self.remap is None:
+            raise RuntimeError("Chame finish() antes de relabel().")
+        if self.labels_path is None:
+            raise RuntimeError("Nenhum arquivo de rótulos foi gravado (labels_path=None).")
+        labels = np.memmap(self.labels_path, dtype=np.int32, mode="r+", shape=(self.rows_seen, self.width))
+        for r0 in range(0, self.rows_seen, block_rows):
+            block = labels[r0:r0 + block_rows]
+            block[:] = self.remap[block]
+        labels.flush()
+        return labels
+
+def label_stream(chunks: Iterable[np.ndarray], width: int | None = None, connectivity: int = 4,
+                 labels_path: str | Path | None = None) -> tuple[np.ndarray, int]:
+    """
+    Rotula um fluxo de blocos de linhas de ponta a ponta.
+    Retorna (props, K): props com rótulos finais 1..K, ordenado por rótulo.
+    Se labels_path for dado, o arquivo bruto int32 (H, W) termina com os rótulos finais.
+    """
+    labeler = None
+    closed = []
+    for chunk in chunks:
+        if not isinstance(chunk, PackedMask):
+            chunk = np.asarray(chunk)
+        if labeler is None:
+            labeler = StreamingLabeler(width or chunk.shape[-1], connectivity, labels_path)
+        closed.append(labeler.feed(chunk))
+    if labeler is None:
+        return np.zeros(0, dtype=PROPS_DTYPE), 0
+
+    closed.append(labeler.finish())
+    props = np.concatenate(closed)
+    props["label"] = labeler.remap[props["label"]]
+    props.sort(order="label")
+    if labels_path is not None:
+        labeler.relabel()
+    return props, labeler.K
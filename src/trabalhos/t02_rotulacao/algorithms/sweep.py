@@ -0,0 +1,89 @@
+"""
+Varredura de limiares: componentes conectados para todos os limiares 0..255.
+
+Com a binarização do T02 (foreground = gray >= t), o foreground só cresce
+quando t diminui. Cada aresta entre pixels vizinhos fica ativa para todo
+t <= min(valor dos dois pixels). Processando as arestas da maior para a menor
+intensidade com um union-find incremental (como na árvore de componentes),
+sabemos quantas uniões efetivas acontecem em cada nível; então
+    componentes(t) = pixels(>= t) - uniões(>= t)
+para os 256 limiares em uma única passada.
+"""
+
+from __future__ import annotations
+import numpy as np
+
+from .labeling import UnionFind
+
+SWEEP_DTYPE = np.dtype([
+    ("thresh", np.int32),
+    ("count", np.int64),        # número de componentes
+    ("foreground", np.int64),   # pixels de foreground
+    ("largest", np.int64),      # área do maior componente
+])
+
+def _neighbor_edges(gray: np.ndarray, connectivity: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Arestas (p, q, peso) entre vizinhos; peso = menor intensidade dos dois pixels."""
+    h, w = gray.shape
+    idx = np.arange(h * w, dtype=np.int32).reshape(h, w)
+    # cada par uma vez: direita, baixo e (8-conn) as duas diagonais de baixo
+    pairs = [((slice(None), slice(0, -1)), (slice(None), slice(1, None))),
+             ((slice(0, -1), slice(None)), (slice(1, None), slice(None)))]
+    if connectivity == 8:
+        pairs += [((slice(0, -1), slice(0, -1)), (slice(1, None), slice(1, None))),
+                  ((slice(0, -1), slice(1, None)), (slice(1, None), slice(0, -1)))]
+    p = np.concatenate([idx[a].ravel() for a, _ in pairs])
+    q = np.concatenate([idx[b].ravel() for _, b in pairs])
+    wgt = np.concatenate([np.minimum(gray[a], gray[b]).ravel() for a, b in pairs])
+    return p, q, wgt
+
+def threshold_sweep(gray: np.ndarray, connectivity: int = 4) -> np.ndarray:
+    """
+    Número de componentes (e área do maior) para cada limiar t = 0..255,
+    com foreground = gray >= t (mesma regra de _binarize).
+    Retorna array estruturado SWEEP_DTYPE com 256 linhas (thresh, count, foreground, largest).
+    """
+    assert connectivity in (4, 8), "connectivity deve ser 4 ou 8"
+    gray = np.clip(gray, 0, 255).astype(np.uint8, copy=False)
+
+    p, q, wgt = _neighbor_edges(gray, connectivity)
+    order = np.argsort(255 - wgt, kind="stable")          # maior intensidade primeiro
+    p, q, wgt = p[order], q[order], wgt[order]
+    level_end = np.searchsorted(255 - wgt, np.arange(256), side="right")
+
+    uf = UnionFind(gray.size)
+    parent = memoryview(uf.parent)
+    size = [1] * gray.size
+    hist = np.bincount(gray.ravel(), minlength=256)
+
+    merges = np.zeros(256, dtype=np.int64)
+    largest = np.zeros(256, dtype=np.int64)
+    biggest = 0
+    start = 0
+    pl, ql = p.tolist(), q.tolist()
+    for lvl, v in enumerate(range(255, -1, -1)):
+        end = int(level_end[lvl])
+        n_merges = 0
+        for i in range(start, end):
+            ra, rb = uf.find(pl[i]), uf.find(ql[i])
+            if ra != rb:
+                if rb < ra:
+                    ra, rb = rb, ra
+                parent[rb] = ra
+                size[ra] += size[rb]
+                if size[ra] > biggest:
+                    biggest = size[ra]
+                n_merges += 1
+        merges[v] = n_merges
+        if hist[v] and biggest == 0:
+            biggest = 1
+        largest[v] = biggest
+        start = end
+
+    foreground = np.cumsum(hist[::-1])[::-1]
+    out = np.zeros(256, dtype=SWEEP_DTYPE)
+    out["thresh"] = np.arange(256)
+    out["foreground"] = foreground
+    out["count"] = foreground - np.cumsum(merges[::-1])[::-1]
+    out["largest"] = largest
+    return out
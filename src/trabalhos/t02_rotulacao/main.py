@@ -5,7 +5,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from PIL import Image
 
-from .algorithms import connected_components
+from .algorithms import connected_components, threshold_sweep, binarize_packed, PackedMask
 
 # Reuso opcional: se você já tem io_utils com load/save, pode importar e usar no lugar
 def _load_any_image(path: str | Path) -> np.ndarray:
@@ -17,32 +17,36 @@ def _load_any_image(path: str | Path) -> np.ndarray:
     gray = arr.mean(axis=2).astype(np.uint8)
     return gray
 
-def _binarize(gray: np.ndarray, thresh: int = 127) -> np.ndarray:
+def _binarize(gray: np.ndarray, thresh: int = 127) -> PackedMask:
     # conforme os slides: f(x,y) < 127 -> 0, senão 255  :contentReference[oaicite:1]{index=1}
-    bin_img = np.where(gray < thresh, 0, 255).astype(np.uint8)
-    # para a rotulação, convertemos 255->1 (foreground), 0 fica 0
-    bin01 = (bin_img == 255).astype(np.uint8)
-    return bin_img, bin01
-
-def _labels_to_color(labels: np.ndarray) -> np.ndarray:
-    """Converte mapa de rótulos para RGB colorido: cada componente recebe uma cor estável."""
-    h, w = labels.shape
-    out = np.zeros((h, w, 3), dtype=np.uint8)
+    # a máscara é gravada direto em bits (1 bit/pixel): bit 1 = foreground (255)
+    return binarize_packed(gray, thresh=thresh)
+
+def _save_mask(mask: PackedMask, path: Path) -> None:
+    """Salva a máscara como PNG de 1 bit (modo "1" do PIL usa o mesmo layout de bits)."""
+    h, w = mask.shape
+    Image.frombytes("1", (w, h), mask.bits.tobytes()).save(path)
+
+def _label_palette(K: int) -> np.ndarray:
+    """Paleta (K+1, 3) uint8: rótulo 0 = preto, 1..K recebem cores estáveis (semente fixa)."""
     rng = np.random.default_rng(42)  # fixo p/ reprodutibilidade
-    palette = {0: (0, 0, 0)}
-    for lab in np.unique(labels):
-        if lab == 0:
-            continue
-        if lab not in palette:
-            palette[lab] = tuple(int(x) for x in rng.integers(64, 256, size=3))
-    for lab, color in palette.items():
-        out[labels == lab] = color
-    return out
-
-def run(imagem: str | None = None, thresh: int | None = 127, conectividade: int | None = 4) -> Path:
+    palette = np.zeros((K + 1, 3), dtype=np.uint8)
+    palette[1:] = rng.integers(64, 256, size=(K, 3))
+    return palette
+
+def _labels_to_color(labels: np.ndarray, K: int | None = None) -> np.ndarray:
+    """Converte mapa de rótulos {0, 1..K} para RGB com um único gather na paleta."""
+    if K is None:
+        K = int(labels.max()) if labels.size else 0
+    return _label_palette(K)[labels]
+
+def run(imagem: str | None = None, thresh: int | None = 127, conectividade: int | None = 4,
+        stats: bool = False, workers: int | None = None) -> Path:
     """
     Trabalho 02 — Conectividade & Rotulação.
     - Lê imagem, binariza por limiar, rotula componentes (4 ou 8), salva resultados.
+    - stats: salva também um CSV com área, caixa envolvente e centróide de cada componente.
+    - workers: se > 1, rotula faixas da imagem em paralelo (mesmo resultado).
     """
     if imagem is None:
         imagem = input("Caminho da imagem (ex: data/manchas.png): ").strip()
@@ -61,8 +65,11 @@ def run(imagem: str | None = None, thresh: int | None = 127, conectividade: int
         raise ValueError("Conectividade inválida. Use 4 ou 8.")
 
     gray = _load_any_image(imagem)
-    bin_img, bin01 = _binarize(gray, thresh=thresh)
-    labels, K = connected_components(bin01, connectivity=conectividade)
+    mask = _binarize(gray, thresh=thresh)
+    if stats:
+        labels, K, props = connected_components(mask, connectivity=conectividade, stats=True, workers=workers)
+    else:
+        labels, K = connected_components(mask, connectivity=conectividade, workers=workers)
 
     # salvar saídas
     outputs = Path("outputs")
@@ -72,25 +79,62 @@ def run(imagem: str | None = None, thresh: int | None = 127, conectividade: int
     bin_path = outputs / f"{base}_bin_t{thresh}.png"
     lab_path = outputs / f"{base}_labels_c{conectividade}.png"
 
-    Image.fromarray(bin_img, mode="L").save(bin_path)
-    Image.fromarray(_labels_to_color(labels), mode="RGB").save(lab_path)
+    _save_mask(mask, bin_path)
+    colored = _labels_to_color(labels, K)  # calculado uma vez: salvar + exibir
+    Image.fromarray(colored, mode="RGB").save(lab_path)
 
     print(f"✅ Componentes encontrados: {K}")
     print(f"🖼️ Binária:  {bin_path}")
     print(f"🖼️ Rótulos:  {lab_path}")
 
+    if stats:
+        props_path = outputs / f"{base}_props_c{conectividade}.csv"
+        np.savetxt(props_path, props, delimiter=",", header=",".join(props.dtype.names),
+                   comments="", fmt=["%d"] * 6 + ["%.3f"] * 2)
+        print(f"📊 Estatísticas: {props_path}")
+
     # visualizar
     try:
         plt.figure(figsize=(12, 4))
         plt.subplot(1, 3, 1); plt.imshow(gray, cmap="gray"); plt.title("Grayscale"); plt.axis("off")
-        plt.subplot(1, 3, 2); plt.imshow(bin_img, cmap="gray"); plt.title(f"Binária (t={thresh})"); plt.axis("off")
-        plt.subplot(1, 3, 3); plt.imshow(_labels_to_color(labels)); plt.title(f"Rótulos (K={K}, {conectividade}-conn)"); plt.axis("off")
+        plt.subplot(1, 3, 2); plt.imshow(mask.unpack(), cmap="gray"); plt.title(f"Binária (t={thresh})"); plt.axis("off")
+        plt.subplot(1, 3, 3); plt.imshow(colored); plt.title(f"Rótulos (K={K}, {conectividade}-conn)"); plt.axis("off")
         plt.tight_layout(); plt.show()
     except Exception as e:
         print(f"(Aviso) Não foi possível exibir a figura: {e}")
 
     return lab_path
 
+def run_sweep(imagem: str, conectividade: int = 4, visualizar: bool = True) -> Path:
+    """
+    Varredura de limiares: nº de componentes (e maior área) para t = 0..255 em uma passada.
+    Salva um CSV em outputs/ e plota componentes x limiar.
+    """
+    if conectividade not in (4, 8):
+        raise ValueError("Conectividade inválida. Use 4 ou 8.")
+    gray = _load_any_image(imagem)
+    sweep = threshold_sweep(gray, connectivity=conectividade)
+
+    outputs = Path("outputs")
+    outputs.mkdir(parents=True, exist_ok=True)
+    csv_path = outputs / f"{Path(imagem).stem}_sweep_c{conectividade}.csv"
+    np.savetxt(csv_path, sweep, delimiter=",", header=",".join(sweep.dtype.names), comments="", fmt="%d")
+
+    print(f"✅ Varredura (0..255, {conectividade}-conn) salva em: {csv_path}")
+    for row in sweep[::32]:
+        print(f"   t={row['thresh']:3d}  K={row['count']:7d}  foreground={row['foreground']:9d}  maior={row['largest']}")
+
+    if visualizar:
+        try:
+            fig, ax = plt.subplots(figsize=(8, 4))
+            ax.plot(sweep["thresh"], sweep["count"])
+            ax.set_xlabel("Limiar"); ax.set_ylabel("Componentes"); ax.set_xlim(0, 255)
+            ax.set_title(f"Componentes por limiar ({conectividade}-conn)")
+            plt.tight_layout(); plt.show()
+        except Exception as e:
+            print(f"(Aviso) Não foi possível exibir a figura: {e}")
+    return csv_path
+
 def questionario():
     """
     Questionário específico do Trabalho 02 — chamado pelo menu global.
@@ -113,8 +157,18 @@ def _cli():
     parser.add_argument("--imagem", type=str, help="Caminho da imagem (RGB/Gray)")
     parser.add_argument("--thresh", type=int, default=127, help="Limiar de binarização (ex.: 127)")
     parser.add_argument("--conectividade", type=int, default=4, help="4 ou 8")
+    parser.add_argument("--stats", action="store_true", help="Salva CSV com área/caixa/centróide por componente")
+    parser.add_argument("--workers", type=int, help="Processos para rotular faixas em paralelo")
+    parser.add_argument("--sweep", action="store_true",
+                        help="Conta componentes para todos os limiares 0..255 em uma passada (ignora --thresh)")
     args = parser.parse_args()
-    run(imagem=args.imagem, thresh=args.thresh, conectividade=args.conectividade)
+    if args.sweep:
+        if not args.imagem:
+            raise SystemExit("Informe --imagem para a varredura de limiares.")
+        run_sweep(imagem=args.imagem, conectividade=args.conectividade)
+        return
+    run(imagem=args.imagem, thresh=args.thresh, conectividade=args.conectividade, stats=args.stats,
+        workers=args.workers)
 
 if __name__ == "__main__":
     _cli()
@@ -0,0 +1,238 @@
+"""
+Motor afim do T03: compõe rotate/translate/flip em uma única matriz 3x3 e
+reamostra a imagem uma só vez (mapeamento inverso + bilinear do T01).
+
+Convenções (coordenadas de pixel, centro do pixel (i, j) em x=j, y=i):
+- rotate:ang    -> anti-horária em torno do centro, mesmo tamanho (como geo.rotate)
+- translate:tx:ty -> mesma semântica de geo.translate (afim do PIL: saída(x,y) = entrada(x+tx, y+ty))
+- flip:modo     -> horizontal | vertical | ambos
+
+Ex.: apply_ops(img, parse_ops("rotate:30,translate:10:5,flip:horizontal"))
+"""
+
+from __future__ import annotations
+import math
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from src.trabalhos.t01_interpolacao.algorithms import round_u8, sample_bilinear
+
+Op = tuple  # ("rotate", ang) | ("translate", tx, ty) | ("flip", modo)
+
+# =========================
+# Matrizes (origem -> destino)
+# =========================
+def rotation_matrix(angle_deg: float, h: int, w: int) -> np.ndarray:
+    """Rotação anti-horária (na tela, eixo y para baixo) em torno do centro da imagem."""
+    t = math.radians(angle_deg)
+    c, s = math.cos(t), math.sin(t)
+    cx, cy = (w - 1) / 2.0, (h - 1) / 2.0
+    rot = np.array([[c, s, 0.0], [-s, c, 0.0], [0.0, 0.0, 1.0]])
+    return translation_matrix(-cx, -cy) @ rot @ translation_matrix(cx, cy)
+
+def translation_matrix(tx: float, ty: float) -> np.ndarray:
+    """Desloca o conteúdo por (-tx, -ty), como a afim (1,0,tx,0,1,ty) do PIL em geo.translate."""
+    return np.array([[1.0, 0.0, -tx], [0.0, 1.0, -ty], [0.0, 0.0, 1.0]])
+
+def flip_matrix(mode: str, h: int, w: int) -> np.ndarray:
+    """Espelhamento: horizontal | vertical | ambos."""
+    sx = -1.0 if mode in ("horizontal", "ambos") else 1.0
+    sy = -1.0 if mode in ("vertical", "ambos") else 1.0
+    if mode not in ("horizontal", "vertical", "ambos"):
+        raise ValueError("mode deve ser 'horizontal', 'vertical' ou 'ambos'.")
+    return np.array([[sx, 0.0, (w - 1) if sx < 0 else 0.0],
+                     [0.0, sy, (h - 1) if sy < 0 else 0.0],
+                     [0.0, 0.0, 1.0]])
+
+def compose(ops: list[Op], shape: tuple[int, ...]) -> np.ndarray:
+    """Compõe a sequência de operações (aplicadas em ordem) em uma matriz 3x3."""
+    return _stages(ops, shape)[-1]
+
+def _stages(ops: list[Op], shape: tuple[int, ...]) -> list[np.ndarray]:
+    """Matrizes acumuladas após cada operação (a última é a composição completa)."""
+    h, w = shape[:2]
+    m = np.eye(3)
+    stages = []
+    for op in ops:
+        name = op[0]
+        if name == "rotate":
+            step = rotation_matrix(op[1], h, w)
+        elif name == "translate":
+            step = translation_matrix(op[1], op[2])
+        elif name == "flip":
+            step = flip_matrix(op[1], h, w)
+        else:
+            raise ValueError(f"Operação geométrica inválida: {name!r}. Use: rotate | translate | flip")
+        m = step @ m
+        stages.append(m)
+    return stages
+
+# =========================
+# Parser "rotate:30,translate:10:5,flip:horizontal"
+# =========================
+def parse_ops(text: str) -> list[Op]:
+    """Converte a cadeia de operações do CLI em uma lista de tuplas."""
+    ops: list[Op] = []
+    for item in filter(None, (p.strip() for p in text.split(","))):
+        name, *args = [a.strip() for a in item.split(":")]
+        name = name.lower()
+        try:
+            if name == "rotate" and len(args) == 1:
+                ops.append(("rotate", float(args[0])))
+            elif name == "translate" and len(args) == 2:
+                ops.append(("translate", float(args[0]), float(args[1])))
+            elif name == "flip" and len(args) <= 1:
+                ops.append(("flip", (args[0] if args else "horizontal").lower()))
+            else:
+                raise ValueError
+        except ValueError:
+            raise ValueError(f"Operação inválida em --ops: {item!r} "
+                             "(use rotate:ang, translate:tx:ty, flip:modo)") from None
+    if not ops:
+        raise ValueError("--ops vazio.")
+    return ops
+
+# =========================
+# Reamostragem única
+# =========================
+# lado padrão do bloco quadrado de saída no modo em blocos
+TILE = 256
+
+def _source_coords(minv: np.ndarray, r0: int, r1: int, c0: int, c1: int) -> tuple[np.ndarray, np.ndarray]:
+    """Coordenadas de origem do bloco [r0, r1) x [c0, c1) da saída."""
+    ys, xs = np.mgrid[r0:r1, c0:c1].astype(np.float64)
+    sx = minv[0, 0] * xs + minv[0, 1] * ys + minv[0, 2]
+    sy = minv[1, 0] * xs + minv[1, 1] * ys + minv[1, 2]
+    return sy, sx
+
+def _outside_stages(stages: list[np.ndarray], sy: np.ndarray, sx: np.ndarray,
+                    h: int, w: int) -> np.ndarray:
+    """
+    Marca os pixels cuja posição em algum quadro intermediário cai fora da
+    imagem: é o conteúdo que a cadeia passo a passo teria perdido (recorte
+    após cada operação), reproduzido aqui sem reamostrar de novo.
+    """
+    out = np.zeros(sy.shape, dtype=bool)
+    for p in stages:
+        qy = p[1, 0] * sx + p[1, 1] * sy + p[1, 2]
+        qx = p[0, 0] * sx + p[0, 1] * sy + p[0, 2]
+        out |= (qy <= -0.5) | (qy >= h - 0.5) | (qx <= -0.5) | (qx >= w - 0.5)
+    return out
+
+def _warp_block(img: np.ndarray, minv: np.ndarray, fill: float, stages: list[np.ndarray] | None,
+                r0: int, r1: int, c0: int, c1: int) -> np.ndarray:
+    """Reamostra um bloco da saída; cada pixel depende só da sua coordenada."""
+    h, w = img.shape[:2]
+    sy, sx = _source_coords(minv, r0, r1, c0, c1)
+    out = sample_bilinear(img, sy, sx, fill)
+    if stages:
+        out[_outside_stages(stages, sy, sx, h, w)] = fill
+    return round_u8(out)
+
+def warp_affine(img: np.ndarray, m: np.ndarray, fill: float = 0.0,
+                stages: list[np.ndarray] | None = None,
+                tile: int | None = None, workers: int | None = None) -> np.ndarray:
+    """
+    Aplica a matriz afim m (origem -> destino) com uma única reamostragem
+    bilinear, mantendo o tamanho. Pixels sem origem recebem `fill`.
+    stages: matrizes intermediárias (origem -> quadro após cada passo) cujo
+            recorte deve ser respeitado, como na aplicação passo a passo.
+    tile: a saída é sempre processada em blocos tile x tile (padrão TILE), o
+            que limita os temporários float64 de coordenadas/pesos ao bloco;
+            cada pixel depende só da sua coordenada, então o resultado não
+            depende do tamanho do bloco.
+    workers: > 1 distribui os blocos em um pool de threads.
+    Retorna uint8 (arredondado).
+    """
+    minv = np.linalg.inv(m)
+    return _run_blocks(img.shape, tile, workers,
+                       lambda r0, r1, c0, c1: _warp_block(img, minv, fill, stages, r0, r1, c0, c1))
+
+def _run_blocks(shape: tuple[int, ...], tile: int | None, workers: int | None, block_fn) -> np.ndarray:
+    """Preenche uma saída uint8 bloco a bloco; workers > 1 usa um pool de threads."""
+    h, w = shape[:2]
+    tile = max(1, int(tile or TILE))
+    out = np.empty(shape, dtype=np.uint8)
+    blocks = [(r0, min(r0 + tile, h), c0, min(c0 + tile, w))
+              for r0 in range(0, h, tile) for c0 in range(0, w, tile)]
+
+    def run(block):
+        r0, r1, c0, c1 = block
+        out[r0:r1, c0:c1] = block_fn(r0, r1, c0, c1)
+
+    if workers is not None and workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            list(ex.map(run, blocks))
+    else:
+        for block in blocks:
+            run(block)
+    return out
+
+# =========================
+# Réplica do bilinear afim do PIL (geo.rotate/translate com workers > 1)
+# =========================
+def pil_rotation_data(angle_deg: float, h: int, w: int) -> tuple[float, ...]:
+    """Coeficientes (a, b, c, d, e, f) que Image.rotate(expand=False) passa ao transform."""
+    angle = float(angle_deg) % 360.0
+    cx, cy = w / 2.0, h / 2.0
+    t = -math.radians(angle)
+    a, b = round(math.cos(t), 15), round(math.sin(t), 15)
+    d, e = round(-math.sin(t), 15), round(math.cos(t), 15)
+    c = a * -cx + b * -cy + 0.0 + cx
+    f = d * -cx + e * -cy + 0.0 + cy
+    return (a, b, c, d, e, f)
+
+def _pil_block(img: np.ndarray, data: tuple[float, ...], r0: int, r1: int, c0: int, c1: int) -> np.ndarray:
+    """
+    Bloco [r0, r1) x [c0, c1) com a mesma conta do PIL (ImagingGenericTransform
+    + filtro bilinear): centros em +0.5, fora de [0, w) x [0, h) vira 0, mistura
+    a + (b - a) * d em double e truncamento para uint8. Mesma ordem das
+    operações em ponto flutuante, logo resultado idêntico ao do PIL.
+    """
+    h, w = img.shape[:2]
+    a, b, c, d, e, f = data
+    y = np.arange(r0, r1, dtype=np.float64)[:, None] + 0.5
+    x = np.arange(c0, c1, dtype=np.float64)[None, :] + 0.5
+    xin = a * x + b * y + c
+    yin = d * x + e * y + f
+    inside = (xin >= 0) & (xin < w) & (yin >= 0) & (yin < h)
+    xin -= 0.5
+    yin -= 0.5
+    xf, yf = np.floor(xin), np.floor(yin)
+    dx, dy = xin - xf, yin - yf
+    if img.ndim == 3:
+        dx, dy = dx[..., None], dy[..., None]
+    xi, yi = xf.astype(np.intp), yf.astype(np.intp)
+    x0, x1 = np.clip(xi, 0, w - 1), np.clip(xi + 1, 0, w - 1)
+    y0, y1 = np.clip(yi, 0, h - 1), np.clip(yi + 1, 0, h - 1)
+    top = img[y0, x0].astype(np.float64)
+    top += (img[y0, x1] - top) * dx
+    bot = img[y1, x0].astype(np.float64)
+    bot += (img[y1, x1] - bot) * dx
+    top += (bot - top) * dy
+    out = top.astype(np.uint8)
+    out[~inside] = 0
+    return out
+
+def warp_pil(img: np.ndarray, data: tuple[float, ...],
+             tile: int | None = None, workers: int | None = None) -> np.ndarray:
+    """
+    Image.transform(AFFINE, data, BILINEAR, fillcolor=0) em blocos, com pool
+    de threads quando workers > 1. Pixel a pixel idêntico ao PIL (uint8).
+    """
+    return _run_blocks(img.shape, tile, workers,
+                       lambda r0, r1, c0, c1: _pil_block(img, data, r0, r1, c0, c1))
+
+def apply_ops(img: np.ndarray, ops: list[Op] | str, fill: float = 0.0,
+              tile: int | None = None, workers: int | None = None) -> np.ndarray:
+    """
+    Compõe as operações e reamostra uma vez. As áreas recortadas entre os
+    passos são as mesmas de geo.rotate/translate/flip em sequência; os valores
+    não: a cadeia passo a passo interpola a cada operação e esta só uma vez
+    (ex.: rotate:30,rotate:-30 aqui volta quase à original). Para uma única
+    operação o resultado fica a no máximo 1 nível do PIL.
+    """
+    if isinstance(ops, str):
+        ops = parse_ops(ops)
+    stages = _stages(ops, img.shape)
+    return warp_affine(img, stages[-1], fill, stages[:-1], tile=tile, workers=workers)
@@ -1,7 +1,12 @@
 from __future__ import annotations
+import hashlib
+import threading
+from functools import lru_cache
 import numpy as np
 from PIL import Image
 
+from src.trabalhos.t01_interpolacao.algorithms import LRUCache
+
 def _ensure_u8(arr: np.ndarray) -> np.ndarray:
     return np.clip(arr, 0, 255).astype(np.uint8)
 
@@ -14,36 +19,150 @@ def _resize_to(img_arr: np.ndarray, target_shape: tuple[int, int]) -> np.ndarray
     pil = pil.resize((tw, th), resample=Image.BILINEAR)
     return np.array(pil)
 
-def coerce_pair(img1: np.ndarray, img2: np.ndarray, mode: str = "resize") -> tuple[np.ndarray, np.ndarray]:
+# =========================
+# Cache LRU de operandos redimensionados
+# =========================
+# Em lotes "muitos para um" (ex.: subtrair o mesmo fundo de milhares de quadros)
+# a mesma img2 é redimensionada para o mesmo tamanho a cada chamada. A chave é
+# (hash do conteúdo, forma, dtype, forma alvo): o resultado é reaproveitado
+# mesmo vindo de outro array com os mesmos pixels e nunca fica velho se o
+# array original for alterado. Os arrays guardados são somente leitura.
+_COERCE_MAXSIZE = 8
+
+_coerce_cache = LRUCache(_COERCE_MAXSIZE)
+
+def _content_key(arr: np.ndarray, target_shape: tuple[int, ...]) -> tuple:
+    digest = hashlib.blake2b(np.ascontiguousarray(arr).data, digest_size=16).digest()
+    return (digest, arr.shape, arr.dtype.str, tuple(target_shape[:2]))
+
+def _resize_cached(img_arr: np.ndarray, target_shape: tuple[int, ...]) -> np.ndarray:
+    def compute():
+        res = _resize_to(img_arr, target_shape)
+        res.setflags(write=False)
+        return res
+    return _coerce_cache.get(_content_key(img_arr, target_shape), compute)
+
+def set_coerce_cache_size(maxsize: int) -> None:
+    """Define quantos operandos redimensionados o cache guarda (0 desliga o cache)."""
+    _coerce_cache.set_maxsize(maxsize)
+
+def clear_coerce_cache() -> None:
+    """Esvazia o cache e zera os contadores."""
+    _coerce_cache.clear()
+
+def coerce_cache_info() -> dict:
+    """Métricas do cache: hits, misses, evictions, size, maxsize e bytes ocupados."""
+    return _coerce_cache.info()
+
+def coerce_pair(img1: np.ndarray, img2: np.ndarray, mode: str = "resize",
+                cache: bool = True) -> tuple[np.ndarray, np.ndarray]:
     """
     Garante que as imagens tenham o mesmo tamanho (H,W).
     Para T03 manter simples e consistente com T01, usamos 'resize' da img2 para img1.
+    cache: reaproveita img2 já redimensionada para o mesmo tamanho (LRU por
+           conteúdo); nesse caso a img2 retornada é somente leitura.
     """
     a = img1
     b = img2
     if a.shape != b.shape:
         if mode == "resize":
-            b = _resize_to(b, a.shape)
+            b = _resize_cached(b, a.shape) if cache else _resize_to(b, a.shape)
         else:
             raise ValueError("Atualmente só 'resize' está implementado.")
     return a, b
 
-def add(img1: np.ndarray, img2: np.ndarray) -> np.ndarray:
+# =========================
+# Caminho inteiro (uint8 -> uint8)
+# =========================
+# Para duas imagens uint8 de mesmo tamanho o resultado é calculado em aritmética
+# inteira saturada (add/sub) ou por tabela 256x256 (mul/div) construída com a
+# mesma fórmula float do caminho geral, então o resultado é idêntico bit a bit.
+# Os buffers intermediários (uint16 para add/sub, intp para os índices da
+# tabela) são por thread e reaproveitados entre chamadas; com out= nada é
+# alocado por quadro.
+_scratch = threading.local()
+
+def _scratch_buf(shape: tuple[int, ...], dtype) -> np.ndarray:
+    n = int(np.prod(shape))
+    key = np.dtype(dtype).char
+    buf = getattr(_scratch, key, None)
+    if buf is None or buf.size < n:
+        buf = np.empty(n, dtype=dtype)
+        setattr(_scratch, key, buf)
+    return buf[:n].reshape(shape)
+
+@lru_cache(maxsize=None)
+def _mul_lut() -> np.ndarray:
+    v = np.arange(256, dtype=np.float32)
+    lut = _ensure_u8((v[:, None] * v[None, :]) / 255.0).reshape(-1)
+    lut.flags.writeable = False
+    return lut
+
+@lru_cache(maxsize=8)
+def _div_lut(eps: float) -> np.ndarray:
+    v = np.arange(256, dtype=np.float32)
+    lut = _ensure_u8((v[:, None] / (v[None, :] + eps)) * 255.0).reshape(-1)
+    lut.flags.writeable = False
+    return lut
+
+def _fast_pair(a: np.ndarray, b: np.ndarray) -> bool:
+    return a.dtype == np.uint8 and b.dtype == np.uint8 and a.shape == b.shape
+
+def _check_out(out: np.ndarray | None, shape: tuple[int, ...]) -> np.ndarray:
+    if out is None:
+        return np.empty(shape, dtype=np.uint8)
+    if out.shape != shape or out.dtype != np.uint8:
+        raise ValueError(f"'out' deve ser uint8 com forma {shape}.")
+    return out
+
+def _lut_pair(lut: np.ndarray, a: np.ndarray, b: np.ndarray, out: np.ndarray) -> np.ndarray:
+    idx = _scratch_buf(a.shape, np.intp)
+    np.left_shift(a, 8, out=idx, dtype=np.intp)       # a*256 + b
+    np.add(idx, b, out=idx, dtype=np.intp)
+    np.take(lut, idx, out=out, mode="clip")   # índices sempre válidos; evita buffer extra
+    return out
+
+def _store(res: np.ndarray, out: np.ndarray | None) -> np.ndarray:
+    """Resultado do caminho float, copiado para 'out' quando fornecido."""
+    if out is None:
+        return res
+    _check_out(out, res.shape)[...] = res
+    return out
+
+def add(img1: np.ndarray, img2: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
     a, b = coerce_pair(img1, img2, "resize")
-    out = _to_float(a) + _to_float(b)
-    return _ensure_u8(out)
+    if _fast_pair(a, b):
+        out = _check_out(out, a.shape)
+        acc = _scratch_buf(a.shape, np.uint16)
+        np.add(a, b, out=acc, dtype=np.uint16)
+        np.minimum(acc, 255, out=acc)
+        np.copyto(out, acc, casting="unsafe")
+        return out
+    res = _to_float(a) + _to_float(b)
+    return _store(_ensure_u8(res), out)
 
-def sub(img1: np.ndarray, img2: np.ndarray) -> np.ndarray:
+def sub(img1: np.ndarray, img2: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
     a, b = coerce_pair(img1, img2, "resize")
-    out = _to_float(a) - _to_float(b)
-    return _ensure_u8(out)
+    if _fast_pair(a, b):
+        out = _check_out(out, a.shape)
+        acc = _scratch_buf(a.shape, np.int16)
+        np.subtract(a, b, out=acc, dtype=np.int16)
+        np.maximum(acc, 0, out=acc)
+        np.copyto(out, acc, casting="unsafe")
+        return out
+    res = _to_float(a) - _to_float(b)
+    return _store(_ensure_u8(res), out)
 
-def mul(img1: np.ndarray, img2: np.ndarray) -> np.ndarray:
+def mul(img1: np.ndarray, img2: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
     a, b = coerce_pair(img1, img2, "resize")
-    out = (_to_float(a) * _to_float(b)) / 255.0
-    return _ensure_u8(out)
+    if _fast_pair(a, b):
+        return _lut_pair(_mul_lut(), a, b, _check_out(out, a.shape))
+    res = (_to_float(a) * _to_float(b)) / 255.0
+    return _store(_ensure_u8(res), out)
 
-def div(img1: np.ndarray, img2: np.ndarray, eps: float = 1e-6) -> np.ndarray:
+def div(img1: np.ndarray, img2: np.ndarray, eps: float = 1e-6, out: np.ndarray | None = None) -> np.ndarray:
     a, b = coerce_pair(img1, img2, "resize")
-    out = (_to_float(a) / (_to_float(b) + eps)) * 255.0
-    return _ensure_u8(out)
+    if _fast_pair(a, b):
+        return _lut_pair(_div_lut(float(eps)), a, b, _check_out(out, a.shape))
+    res = (_to_float(a) / (_to_float(b) + eps)) * 255.0
+    return _store(_ensure_u8(res), out)
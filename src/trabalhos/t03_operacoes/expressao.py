@@ -0,0 +1,196 @@
+"""
+Motor de expressões aritméticas fundidas para o T03.
+
+    evaluate("(a + b) * c / d", a=img1, b=img2, c=img3, d=img4)
+
+A expressão é compilada uma vez (ast -> lista de passos sobre registradores)
+e avaliada em blocos do tamanho da cache, com um buffer float32 por
+registrador (uma cadeia como (a+b)*c/d usa um só). Nada é requantizado entre
+os passos: o recorte para 0..255 acontece só no final.
+
+Semântica igual à de aritmetica.py, aplicada à expressão inteira:
+  a + b, a - b  -> soma/subtração em níveis de cinza
+  a * b         -> a*b/255          (como ar.mul)
+  a / b         -> a/(b+eps)*255    (como ar.div)
+  constantes    -> em + e - valem níveis de cinza (a + 10); em * e / são fatores (a * 0.5)
+Para isso cada valor intermediário carrega uma escala de compilação s (valor
+normalizado = R / s), e o ajuste de escala é aplicado uma única vez no fim.
+"""
+
+from __future__ import annotations
+import ast
+from functools import lru_cache
+import numpy as np
+
+from .aritmetica import coerce_pair
+
+# elementos float32 por bloco (~256 KiB por registrador)
+CHUNK = 1 << 16
+
+_BINOPS = {ast.Add: np.add, ast.Sub: np.subtract, ast.Mult: np.multiply, ast.Div: np.divide}
+
+class _Compiler:
+    """Converte a árvore em passos (ufunc, op_a, op_b, registrador_destino)."""
+
+    def __init__(self):
+        self.steps: list = []
+        self.names: list[str] = []
+        self.n_regs = 0
+        self._free: list[int] = []
+
+    # operandos: ("img", nome) | ("const", valor) | ("eps", fator) | ("reg", i)
+    def _alloc(self) -> int:
+        if self._free:
+            return self._free.pop()
+        self.n_regs += 1
+        return self.n_regs - 1
+
+    def _emit(self, ufunc, a, b):
+        # o resultado reaproveita o registrador de um dos operandos quando houver
+        regs = [o[1] for o in (a, b) if o[0] == "reg"]
+        dst = regs[0] if regs else self._alloc()
+        for r in regs[1:]:
+            self._free.append(r)
+        self.steps.append((ufunc, a, b, dst))
+        return ("reg", dst)
+
+    def _rescale(self, op, factor: float):
+        return op if factor == 1.0 else self._emit(np.multiply, op, ("const", factor))
+
+    def visit(self, node):
+        """Retorna (operando, escala); escala None indica constante."""
+        if isinstance(node, ast.Name):
+            if node.id not in self.names:
+                self.names.append(node.id)
+            return ("img", node.id), 255.0
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) \
+                and not isinstance(node.value, bool):
+            return ("const", float(node.value)), None
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+            op, s = self.visit(node.operand)
+            if isinstance(node.op, ast.UAdd):
+                return op, s
+            if s is None:
+                return ("const", -op[1]), None
+            return self._emit(np.multiply, op, ("const", -1.0)), s
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINOPS:
+            return self._binop(type(node.op), self.visit(node.left), self.visit(node.right))
+        raise ValueError(f"Expressão inválida: '{type(node).__name__}' não suportado. "
+                         "Use nomes, números, + - * / e parênteses.")
+
+    def _binop(self, kind, left, right):
+        (x, sx), (y, sy) = left, right
+        if sx is None and sy is None:
+            try:
+                return ("const", float(_BINOPS[kind](x[1], y[1]))), None
+            except ZeroDivisionError:
+                raise ValueError("Divisão por zero entre constantes.")
+
+        if kind in (ast.Add, ast.Sub):
+            ufunc = _BINOPS[kind]
+            if sy is None:                        # imagem ± constante (níveis de cinza)
+                return self._emit(ufunc, x, ("const", y[1] * sx / 255.0)), sx
+            if sx is None:
+                return self._emit(ufunc, ("const", x[1] * sy / 255.0), y), sy
+            if sx != sy:                          # alinha as escalas antes de somar
+                y = self._rescale(y, sx / sy)
+            return self._emit(ufunc, x, y), sx
+
+        if kind is ast.Mult:
+            if sx is None:
+                return self._emit(np.multiply, x, y), sy
+            if sy is None:
+                return self._emit(np.multiply, x, y), sx
+            return self._emit(np.multiply, x, y), sx * sy
+
+        # divisão
+        if sy is None:
+            if y[1] == 0:
+                raise ValueError("Divisão por zero.")
+            return self._emit(np.divide, x, y), sx
+        # denominador com imagem: soma eps (em níveis de cinza, como ar.div)
+        den = self._emit(np.add, y, ("eps", sy / 255.0))
+        if sx is None:
+            return self._emit(np.divide, x, den), 1.0 / sy
+        return self._emit(np.divide, x, den), sx / sy
+
+class Expression:
+    """Expressão compilada; chame com as imagens nomeadas (ex.: expr(a=img1, b=img2))."""
+
+    def __init__(self, text: str):
+        try:
+            tree = ast.parse(text.strip(), mode="eval")
+        except SyntaxError as e:
+            raise ValueError(f"Expressão inválida: {e.msg}") from None
+        comp = _Compiler()
+        result, scale = comp.visit(tree.body)
+        if scale is None:
+            raise ValueError("A expressão precisa usar ao menos uma imagem.")
+        if result[0] != "reg":
+            result = comp._emit(np.multiply, result, ("const", 1.0))
+        # ajuste final de escala: valor em 0..255 = R * 255 / s
+        if scale > 255.0:
+            comp._emit(np.divide, result, ("const", scale / 255.0))
+        elif scale < 255.0:
+            comp._emit(np.multiply, result, ("const", 255.0 / scale))
+
+        self.text = text
+        self.names = tuple(comp.names)
+        self._steps = tuple(comp.steps)
+        self._result = result[1]
+        self.n_buffers = max(comp.n_regs, 1)
+
+    def __call__(self, out: np.ndarray | None = None, eps: float = 1e-6,
+                 chunk: int = CHUNK, **images: np.ndarray) -> np.ndarray:
+        missing = [n for n in self.names if n not in images]
+        if missing:
+            raise ValueError(f"Faltam imagens para: {', '.join(missing)}")
+
+        # todas no tamanho da primeira (mesma regra de coerce_pair)
+        ref = np.asarray(images[self.names[0]])
+        flat = {}
+        for name in self.names:
+            _, img = coerce_pair(ref, np.asarray(images[name]), "resize")
+            if img.shape != ref.shape:
+                # resize só ajusta (H,W): canais diferentes seriam lidos intercalados
+                raise ValueError(f"Imagem {name!r} com forma {img.shape} incompatível com "
+                                 f"{self.names[0]!r} {ref.shape}: as imagens precisam ter o mesmo número de canais.")
+            flat[name] = np.ascontiguousarray(img).reshape(-1)
+
+        if out is None:
+            out = np.empty(ref.shape, dtype=np.uint8)
+        elif out.shape != ref.shape or out.dtype != np.uint8:
+            raise ValueError(f"'out' deve ser uint8 com forma {ref.shape}.")
+        out_flat = out.reshape(-1)
+
+        regs = [np.empty(chunk, dtype=np.float32) for _ in range(self.n_buffers)]
+        total = out_flat.shape[0]
+        for i0 in range(0, total, chunk):
+            i1 = min(i0 + chunk, total)
+            n = i1 - i0
+
+            def operand(op):
+                kind, val = op
+                if kind == "img":
+                    return flat[val][i0:i1]
+                if kind == "reg":
+                    return regs[val][:n]
+                if kind == "eps":
+                    return eps * val
+                return val
+
+            for ufunc, a, b, dst in self._steps:
+                ufunc(operand(a), operand(b), out=regs[dst][:n], dtype=np.float32)
+            res = regs[self._result][:n]
+            np.clip(res, 0, 255, out=res)
+            out_flat[i0:i1] = res
+        return out
+
+@lru_cache(maxsize=64)
+def compile_expression(text: str) -> Expression:
+    """Compila (e guarda em cache) uma expressão."""
+    return Expression(text)
+
+def evaluate(text: str, out: np.ndarray | None = None, eps: float = 1e-6, **images: np.ndarray) -> np.ndarray:
+    """Compila (uma vez) e avalia a expressão sobre as imagens nomeadas; retorna uint8."""
+    return compile_expression(text)(out=out, eps=eps, **images)
@@ -2,19 +2,56 @@ from __future__ import annotations
 import numpy as np
 from PIL import Image
 
-def rotate(img: np.ndarray, angle_deg: float = 45.0) -> np.ndarray:
+from . import afim
+
+def _view(arr: np.ndarray) -> np.ndarray:
+    """Vista somente leitura (não altera a imagem de entrada por engano)."""
+    v = arr.view()
+    v.flags.writeable = False
+    return v
+
+def _quarter_turns(img: np.ndarray, angle_deg: float) -> int | None:
+    """
+    Número de quartos de volta quando a rotação é exata sem interpolação.
+    Segue os mesmos casos em que o PIL (expand=False) só transpõe a imagem:
+    0°, 180° e, para imagens quadradas, 90°/270°. Caso contrário, None.
+    """
+    a = float(angle_deg) % 360.0
+    if a in (0.0, 180.0):
+        return int(a // 90)
+    if a in (90.0, 270.0) and img.shape[0] == img.shape[1]:
+        return int(a // 90)
+    return None
+
+def rotate(img: np.ndarray, angle_deg: float = 45.0,
+           workers: int | None = None, tile: int | None = None) -> np.ndarray:
     """
     Rotação anti-horária mantendo o mesmo tamanho da imagem (expand=False).
     Interpolação bilinear (como no T01).
+    Múltiplos de 90° sem recorte (0°, 180°, ou 90°/270° em imagem quadrada)
+    retornam uma vista somente leitura, sem cópia nem interpolação.
+    workers > 1: divide a saída em blocos tile x tile processados por um pool
+    de threads (afim.warp_pil), com resultado idêntico ao do PIL. Com
+    workers <= 1 o PIL de uma thread é mais rápido e tile é ignorado.
     """
+    k = _quarter_turns(img, angle_deg)
+    if k is not None:
+        return _view(np.rot90(img, k))
+    if workers is not None and workers > 1:
+        h, w = img.shape[:2]
+        return afim.warp_pil(img, afim.pil_rotation_data(angle_deg, h, w), tile=tile, workers=workers)
     pil = Image.fromarray(img)
     rot = pil.rotate(angle=angle_deg, resample=Image.BILINEAR, expand=False, fillcolor=0)
     return np.array(rot)
 
-def translate(img: np.ndarray, tx: int = 40, ty: int = 40) -> np.ndarray:
+def translate(img: np.ndarray, tx: int = 40, ty: int = 40,
+              workers: int | None = None, tile: int | None = None) -> np.ndarray:
     """
     Translação usando transformação afim do PIL (preenche com 0 fora da imagem).
+    workers > 1: blocos em pool de threads (afim.warp_pil), idêntico ao PIL.
     """
+    if workers is not None and workers > 1:
+        return afim.warp_pil(img, (1.0, 0.0, float(tx), 0.0, 1.0, float(ty)), tile=tile, workers=workers)
     h, w = img.shape[:2]
     pil = Image.fromarray(img)
     # Matriz afim (a, b, c, d, e, f) corresponde a:
@@ -25,13 +62,16 @@ def translate(img: np.ndarray, tx: int = 40, ty: int = 40) -> np.ndarray:
     return np.array(out)
 
 def flip(img: np.ndarray, mode: str = "horizontal") -> np.ndarray:
-    pil = Image.fromarray(img)
+    """
+    Espelhamento como vista somente leitura (strides negativos, O(1)).
+    Use .copy() se precisar alterar o resultado.
+    """
     if mode == "horizontal":
-        out = pil.transpose(Image.FLIP_LEFT_RIGHT)
+        out = img[:, ::-1]
     elif mode == "vertical":
-        out = pil.transpose(Image.FLIP_TOP_BOTTOM)
+        out = img[::-1]
     elif mode == "ambos":
-        out = pil.transpose(Image.FLIP_LEFT_RIGHT).transpose(Image.FLIP_TOP_BOTTOM)
+        out = img[::-1, ::-1]
     else:
         raise ValueError("mode deve ser 'horizontal', 'vertical' ou 'ambos'.")
-    return np.array(out)
+    return _view(out)
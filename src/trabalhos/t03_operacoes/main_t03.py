@@ -6,6 +6,9 @@ import numpy as np
 
 from . import aritmetica as ar
 from . import geometria as geo
+from . import afim
+from .expressao import evaluate
+from .pilha import reduce_stack
 from .io_utils import (
     load_image, save_image,
     auto_out_name, name_arit, name_geo,
@@ -48,19 +51,41 @@ def run_geometria(
     tx: int = 40,
     ty: int = 40,
     mode: str = "horizontal",
-    out: str | None = None
+    out: str | None = None,
+    ops: str | None = None,
+    workers: int | None = None,
+    tile: int | None = None
 ) -> Path:
     """
     Executa operação geométrica em uma imagem (grayscale):
     rotate | translate | flip
+    - ops: cadeia "rotate:30,translate:10:5,flip:horizontal" composta em uma
+      única matriz afim e reamostrada uma vez (ignora gop e seus parâmetros).
+    - workers/tile: blocos tile x tile com pool de threads. rotate/translate só
+      usam blocos com workers > 1 (resultado idêntico ao PIL); --ops sempre.
     """
     img = load_image(imagem)
 
+    if ops:
+        cadeia = afim.parse_ops(ops)
+        out_img = afim.apply_ops(img, cadeia, tile=tile, workers=workers)
+        if out:
+            out_path = Path(out)
+        else:
+            extra = "_".join(op[0] + "x".join(f"{v:g}" if isinstance(v, float) else v for v in op[1:])
+                             for op in cadeia)
+            out_path = auto_out_name(prefix="t03_ops", base=Path(imagem).stem, extra=extra)
+        save_image(out_img, out_path)
+        print(f"✅ [{ops}] salvo em: {out_path}")
+
+        show_side_by_side("Original", img, "Resultado (afim composta)", out_img)
+        return out_path
+
     gop = gop.strip().lower()
     if   gop == "rotate":
-        out_img = geo.rotate(img, angle_deg=angle)
+        out_img = geo.rotate(img, angle_deg=angle, workers=workers, tile=tile)
     elif gop == "translate":
-        out_img = geo.translate(img, tx=tx, ty=ty)
+        out_img = geo.translate(img, tx=tx, ty=ty, workers=workers, tile=tile)
     elif gop == "flip":
         out_img = geo.flip(img, mode=mode)
     else:
@@ -74,6 +99,73 @@ def run_geometria(
     return out_path
 
 
+def run_expressao(expr: str, imagens: dict[str, str], out: str | None = None) -> Path:
+    """
+    Avalia uma expressão aritmética fundida sobre imagens nomeadas, ex.:
+      expr="(a + b) * c / d", imagens={"a": "data/flor.png", "b": ...}
+    - Uma única passada em blocos, sem requantizar entre as operações.
+    - As imagens são ajustadas ao tamanho da primeira que aparece na expressão.
+    """
+    imgs = {nome: load_image(caminho) for nome, caminho in imagens.items()}
+    out_img = evaluate(expr, **imgs)
+
+    if out:
+        out_path = Path(out)
+    else:
+        base = "__".join(Path(c).stem for c in imagens.values())
+        out_path = auto_out_name(prefix="t03_expr", base=base)
+    save_image(out_img, out_path)
+    print(f"✅ [{expr}] salvo em: {out_path}")
+
+    primeira = next(iter(imgs.values()))
+    show_side_by_side("Imagem 1", primeira, f"Resultado {expr}", out_img)
+    return out_path
+
+
+IMG_SUFFIXES = {".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff"}
+
+def run_pilha(op: str, imagens: list[str], pasta: str | None = None,
+              prefetch: int = 2, out: str | None = None) -> Path:
+    """
+    Reduz uma pilha de imagens (mean | sum | min | max) em fluxo, com memória
+    constante: acumulador uint32 único e pré-carga em outra thread.
+    - pasta: acrescenta os arquivos de imagem da pasta (ordem alfabética).
+    - sum é salvo como .npy (uint32); os demais como PNG.
+    """
+    caminhos = list(imagens or [])
+    if pasta:
+        caminhos += sorted(str(p) for p in Path(pasta).iterdir() if p.suffix.lower() in IMG_SUFFIXES)
+    if not caminhos:
+        raise ValueError("Informe --imagens e/ou --pasta.")
+
+    op = op.strip().lower()
+    out_img, n = reduce_stack(caminhos, op=op, prefetch=prefetch)
+
+    base = Path(pasta).name if pasta else Path(caminhos[0]).stem
+    if op == "sum":
+        out_path = Path(out) if out else auto_out_name(prefix="t03_pilha_sum", base=base, extra=f"n{n}", suffix=".npy")
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(out_path, out_img)
+    else:
+        out_path = Path(out) if out else auto_out_name(prefix=f"t03_pilha_{op}", base=base, extra=f"n{n}")
+        save_image(out_img, out_path)
+    print(f"✅ [pilha {op}, {n} imagens] salvo em: {out_path}")
+
+    show_side_by_side("Imagem 1", load_image(caminhos[0]), f"Pilha {op} (N={n})", out_img)
+    return out_path
+
+
+def _parse_imagens(pares: list[str]) -> dict[str, str]:
+    """Converte ['a=data/flor.png', ...] em {'a': 'data/flor.png', ...}."""
+    imagens = {}
+    for par in pares:
+        nome, sep, caminho = par.partition("=")
+        if not sep or not nome.strip().isidentifier() or not caminho:
+            raise ValueError(f"--img deve ser nome=caminho (recebido: {par!r})")
+        imagens[nome.strip()] = caminho
+    return imagens
+
+
 # =========================
 # Questionário (minimalista)
 # =========================
@@ -86,7 +178,8 @@ def questionario():
     print("\n=== T03 — Operações Aritméticas & Geométricas ===")
     print("[1] Aritmética (add, sub, mul, div)")
     print("[2] Geométrica (rotate, translate, flip)")
-    tipo = ask("Escolha 1 ou 2", default="1")
+    print("[3] Expressão (ex.: (a + b) * c / d)")
+    tipo = ask("Escolha 1, 2 ou 3", default="1")
 
     if tipo == "1":
         op = ask("Operação", default="add").lower()
@@ -110,6 +203,12 @@ def questionario():
             run_geometria(gop=gop, imagem=imagem, mode=mode, out=None)
         else:
             print("Opção geométrica inválida.")
+
+    elif tipo == "3":
+        expr = ask("Expressão", default="(a + b) / 2")
+        pares = ask("Imagens (nome=caminho, separadas por espaço)",
+                    default="a=data/flor.png b=data/manchas.png")
+        run_expressao(expr=expr, imagens=_parse_imagens(pares.split()), out=None)
     else:
         print("Opção inválida.")
 
@@ -126,6 +225,15 @@ def _cli():
       python -m src.trabalhos.t03_operacoes.main_t03 geo \
         --gop rotate --imagem data/flor.png --angle 30
 
+      python -m src.trabalhos.t03_operacoes.main_t03 geo \
+        --imagem data/flor.png --ops rotate:30,translate:10:5,flip:horizontal
+
+      python -m src.trabalhos.t03_operacoes.main_t03 expr \
+        --expr "(a + b) * c / d" --img a=data/flor.png --img b=data/manchas.png \
+        --img c=data/flor.png --img d=data/manchas.png
+
+      python -m src.trabalhos.t03_operacoes.main_t03 pilha --op mean --pasta data
+
       python -m src.trabalhos.t03_operacoes.main_t03  # sem subcomando → questionário
     """
     p = argparse.ArgumentParser(description="T03 — Operações Aritméticas & Geométricas (PIL+NumPy)")
@@ -146,8 +254,30 @@ def _cli():
     pg.add_argument("--tx", type=int, default=40)
     pg.add_argument("--ty", type=int, default=40)
     pg.add_argument("--mode", default="horizontal")
+    pg.add_argument("--ops", help="Cadeia composta em uma só reamostragem, "
+                                  "ex.: rotate:30,translate:10:5,flip:horizontal")
+    pg.add_argument("--workers", type=int, default=None,
+                    help="Threads para o warp em blocos (rotate/translate: só com > 1; "
+                         "resultado idêntico ao PIL)")
+    pg.add_argument("--tile", type=int, default=None,
+                    help="Lado do bloco de saída do warp em blocos (padrão 256)")
     pg.add_argument("--out", help="(Opcional) caminho de saída; se ausente, será automático")
 
+    # Expressão fundida
+    pe = sub.add_parser("expr", help="Expressão aritmética fundida sobre várias imagens")
+    pe.add_argument("--expr", required=True, help='Ex.: "(a + b) * c / d"')
+    pe.add_argument("--img", action="append", required=True, metavar="NOME=CAMINHO",
+                    help="Imagem nomeada usada na expressão (repita para cada nome)")
+    pe.add_argument("--out", help="(Opcional) caminho de saída; se ausente, será automático")
+
+    # Pilha de N imagens
+    pp = sub.add_parser("pilha", help="Redução em fluxo de N imagens (mean|sum|min|max)")
+    pp.add_argument("--op", choices=["mean", "sum", "min", "max"], default="mean")
+    pp.add_argument("--imagens", nargs="*", default=[], help="Caminhos das imagens")
+    pp.add_argument("--pasta", help="Pasta com as imagens (ordem alfabética)")
+    pp.add_argument("--prefetch", type=int, default=2, help="Imagens pré-carregadas (0 desliga a thread)")
+    pp.add_argument("--out", help="(Opcional) caminho de saída; se ausente, será automático")
+
     args = p.parse_args()
     if args.grupo == "arit":
         run_aritmetica(op=args.op, imagem=args.imagem, imagem2=args.imagem2, out=args.out)
@@ -159,8 +289,16 @@ def _cli():
             tx=args.tx,
             ty=args.ty,
             mode=args.mode,
-            out=args.out
+            out=args.out,
+            ops=args.ops,
+            workers=args.workers,
+            tile=args.tile
         )
+    elif args.grupo == "pilha":
+        run_pilha(op=args.op, imagens=args.imagens, pasta=args.pasta,
+                  prefetch=args.prefetch, out=args.out)
+    elif args.grupo == "expr":
+        run_expressao(expr=args.expr, imagens=_parse_imagens(args.img), out=args.out)
     else:
         questionario()
 
@@ -0,0 +1,104 @@
+"""
+Redução de uma pilha de N imagens (mean | sum | min | max) em fluxo.
+
+As imagens chegam de um iterável (caminhos ou arrays) e são acumuladas em um
+único buffer: uint32 para sum/mean (sem saturar em 255) ou uint8 para min/max.
+A memória não cresce com N. Uma thread de pré-carga decodifica as próximas
+imagens enquanto a atual é acumulada (fila limitada a `prefetch` itens).
+
+Imagens com tamanho diferente da primeira são ajustadas com coerce_pair.
+"""
+
+from __future__ import annotations
+import queue
+import threading
+from pathlib import Path
+from typing import Iterable
+import numpy as np
+
+from .aritmetica import coerce_pair
+from .io_utils import load_image
+
+OPS = ("mean", "sum", "min", "max")
+
+_END = object()
+
+def _as_array(item) -> np.ndarray:
+    if isinstance(item, (str, Path)):
+        return load_image(item)
+    return np.asarray(item)
+
+def _prefetched(items: Iterable, prefetch: int):
+    """Itera as imagens já decodificadas, carregando as próximas em outra thread."""
+    if prefetch <= 0:
+        for item in items:
+            yield _as_array(item)
+        return
+
+    q: queue.Queue = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+
+    def worker():
+        try:
+            for item in items:
+                if stop.is_set():
+                    return
+                q.put(_as_array(item))
+            q.put(_END)
+        except BaseException as e:       # repassa o erro para quem consome
+            q.put(e)
+
+    t = threading.Thread(target=worker, daemon=True)
+    t.start()
+    try:
+        while True:
+            got = q.get()
+            if got is _END:
+                return
+            if isinstance(got, BaseException):
+                raise got
+            yield got
+    finally:
+        stop.set()
+        while t.is_alive():              # libera o produtor se ele estiver bloqueado no put
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                t.join(timeout=0.01)
+
+def reduce_stack(items: Iterable, op: str = "mean", prefetch: int = 2) -> tuple[np.ndarray, int]:
+    """
+    Reduz uma sequência de imagens (caminhos ou arrays uint8) com `op`.
+    - mean: média arredondada, uint8
+    - sum : soma exata, uint32 (não cabe em PNG; salve como .npy)
+    - min/max: uint8
+    Retorna (resultado, número de imagens).
+    """
+    op = op.strip().lower()
+    if op not in OPS:
+        raise ValueError("Operação inválida. Use: mean | sum | min | max")
+
+    acc = None
+    ref = None
+    n = 0
+    for img in _prefetched(items, prefetch):
+        if ref is None:
+            ref = img
+            acc = img.astype(np.uint32) if op in ("mean", "sum") else img.astype(np.uint8, copy=True)
+        else:
+            _, img = coerce_pair(ref, img, "resize", cache=False)
+            if op in ("mean", "sum"):
+                np.add(acc, img, out=acc)
+            elif op == "min":
+                np.minimum(acc, img, out=acc)
+            else:
+                np.maximum(acc, img, out=acc)
+        n += 1
+
+    if n == 0:
+        raise ValueError("Pilha vazia: nenhuma imagem recebida.")
+    if op == "mean":
+        acc += n // 2                      # arredonda (meio para cima)
+        acc //= n
+        return acc.astype(np.uint8), n
+    return acc, n
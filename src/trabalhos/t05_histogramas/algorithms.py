@@ -4,13 +4,35 @@ import numpy as np
 def ensure_u8(img: np.ndarray) -> np.ndarray:
     return np.clip(img, 0, 255).astype(np.uint8)
 
-def _quantize_indices(img: np.ndarray, L: int) -> np.ndarray:
+def _native(img: np.ndarray) -> np.ndarray:
+    """uint8 e uint16 seguem como estão; outros tipos viram uint8 (como antes)."""
+    if img.dtype == np.uint8 or img.dtype == np.uint16:
+        return img
+    return ensure_u8(img)
+
+def _levels(img: np.ndarray) -> int:
+    """Número de níveis do tipo da imagem: 256 (uint8) ou 65536 (uint16)."""
+    return 65536 if img.dtype == np.uint16 else 256
+
+def _level_range(levels: int) -> np.ndarray:
+    """Todos os níveis 0..levels-1 no tipo da imagem (uint8 ou uint16)."""
+    return np.arange(levels, dtype=np.uint8 if levels <= 256 else np.uint16)
+
+def _out_max(img: np.ndarray, out_bits: int | None) -> int:
+    """Maior valor de saída: o da própria imagem, ou 2^out_bits - 1 (8 ou 16 bits)."""
+    if out_bits is None:
+        return _levels(img) - 1
+    if out_bits not in (8, 16):
+        raise ValueError("out_bits deve ser 8 ou 16.")
+    return (1 << out_bits) - 1
+
+def _quantize_indices(img: np.ndarray, L: int, levels: int = 256) -> np.ndarray:
     """
-    Mapear níveis 0..255 para índices 0..L-1:
-      k = floor( img * L / 256 )
+    Mapear níveis 0..levels-1 (256 ou 65536) para índices 0..L-1:
+      k = floor( img * L / levels )
     """
-    img = ensure_u8(img).astype(np.int32)
-    idx = (img * L) // 256
+    img = _native(img).astype(np.int64)
+    idx = (img * L) // levels
     # por segurança, garanta o teto
     return np.clip(idx, 0, L - 1).astype(np.int32)
 
@@ -19,24 +41,186 @@ def _dequantize_to_255(idx: np.ndarray, L: int) -> np.ndarray:
     Mapear índices 0..L-1 de volta para 0..255:
       v = round( idx * 255 / (L-1) )
     """
+    return _dequantize(idx, L, 255)
+
+def _dequantize(idx: np.ndarray, L: int, out_max: int) -> np.ndarray:
+    """Índices 0..L-1 -> 0..out_max (uint8 se out_max <= 255, senão uint16)."""
+    dtype = np.uint8 if out_max <= 255 else np.uint16
     if L <= 1:
-        return np.zeros_like(idx, dtype=np.uint8)
-    v = np.round(idx.astype(np.float32) * (255.0 / float(L - 1)))
-    return ensure_u8(v)
+        return np.zeros_like(idx, dtype=dtype)
+    ftype = np.float32 if out_max <= 255 else np.float64
+    v = np.round(idx.astype(ftype) * (float(out_max) / float(L - 1)))
+    return np.clip(v, 0, out_max).astype(dtype)
+
+# =========================
+# LUTs de 256 entradas (uint8 -> uint8)
+# =========================
+# Toda operação pontual vira uma LUT de 256 entradas; LUTs se compõem por
+# indexação (lut2[lut1]) e a cadeia inteira é aplicada à imagem uma única vez.
+_LEVELS = np.arange(256, dtype=np.uint8)
+
+# bincount/take convertem os índices para intp: em blocos desse tamanho a
+# conversão fica na cache em vez de gerar um temporário do tamanho da imagem
+_CHUNK = 1 << 16
+
+def _hist(img: np.ndarray, levels: int) -> np.ndarray:
+    """Histograma com `levels` bins de uma imagem uint8/uint16 (sem cópias int32/float)."""
+    flat = img.ravel()
+    h = np.zeros(levels, dtype=np.int64)
+    for i in range(0, flat.size, _CHUNK):
+        h += np.bincount(flat[i:i + _CHUNK], minlength=levels)
+    return h
+
+def _hist256(img: np.ndarray) -> np.ndarray:
+    """Histograma de 256 bins de uma imagem uint8."""
+    return _hist(img, 256)
+
+def _fold_hist(h: np.ndarray, lut: np.ndarray, L: int = 256) -> np.ndarray:
+    """Histograma da imagem após a LUT, calculado só a partir do histograma (O(256))."""
+    return np.bincount(lut, weights=h, minlength=L)[:L].astype(np.int64)
+
+def identity_lut() -> np.ndarray:
+    return _LEVELS.copy()
+
+def negative_lut() -> np.ndarray:
+    """s = 255 - r"""
+    return 255 - _LEVELS
+
+def gamma_lut(gamma: float, c: float = 1.0) -> np.ndarray:
+    """s = round(255 * c * (r/255)^gamma)"""
+    if gamma <= 0:
+        raise ValueError("gamma deve ser > 0.")
+    r = _LEVELS.astype(np.float64) / 255.0
+    return ensure_u8(np.round(255.0 * c * r ** gamma))
+
+def quantize_lut(L: int) -> np.ndarray:
+    """Quantiza para L níveis e expande de volta para 0..255 (mesmas fórmulas de _quantize_indices/_dequantize_to_255)."""
+    if L < 2:
+        raise ValueError("L deve ser >= 2.")
+    if L >= 256:
+        return identity_lut()
+    return _dequantize_to_255(_quantize_indices(_LEVELS, L), L)
+
+def stretch_lut(a: int = 0, b: int = 255, c: int = 0, d: int = 255,
+                levels: int = 256, out_max: int = 255) -> np.ndarray:
+    """
+    Alargamento linear [c,d] -> [a,b] (mesma fórmula float32 de contrast_stretch).
+    levels: entradas da LUT (256 ou 65536); out_max: maior valor de saída (255 ou 65535).
+    """
+    dtype = np.uint8 if out_max <= 255 else np.uint16
+    if d == c:
+        return np.full(levels, min(max(int(a), 0), out_max), dtype=dtype)
+    F = np.arange(levels, dtype=np.float32)
+    G = (F - c) * ((b - a) / float(d - c)) + a
+    return np.clip(G, 0, out_max).astype(dtype)
+
+def equalize_lut(h: np.ndarray, L: int | None = None, out_max: int | None = None) -> np.ndarray:
+    """
+    LUT da equalização (entradas = bins de h, 256 ou 65536), a partir do histograma.
+    Para L < bins: quantiza, equaliza no domínio 0..L-1 e expande para 0..out_max
+    (padrão: o mesmo intervalo da entrada).
+    """
+    levels = len(h)
+    L = levels if L is None else int(L)
+    out_max = levels - 1 if out_max is None else int(out_max)
+    if not 2 <= L <= levels:
+        raise ValueError(f"L deve estar entre 2 e {levels}.")
+    q = _quantize_indices(_level_range(levels), L, levels) if L < levels else _level_range(levels)
+    lut_L = equalization_lut(histogram_normalized(_fold_hist(h, q, L)), L=L)
+    if L == levels and out_max == L - 1:
+        return lut_L
+    return _dequantize(lut_L[q], L, out_max)
+
+def compose_luts(*luts: np.ndarray) -> np.ndarray:
+    """Composição na ordem de aplicação: compose_luts(l1, l2) == l2[l1]."""
+    out = identity_lut()
+    for lut in luts:
+        out = lut[out]
+    return out
+
+def parse_lut_ops(text: str) -> list[tuple]:
+    """
+    "equalize,stretch:0:255,gamma:0.5,negative,quantize:8" -> lista de operações.
+    equalize[:L] | stretch[:a:b[:c:d]] | quantize:L | negative | gamma:g
+    """
+    ops: list[tuple] = []
+    for item in filter(None, (p.strip() for p in text.split(","))):
+        name, *args = [a.strip() for a in item.split(":")]
+        name = name.lower()
+        try:
+            if name == "equalize" and len(args) <= 1:
+                ops.append(("equalize", int(args[0]) if args else 256))
+            elif name == "stretch" and len(args) in (0, 2, 4):
+                vals = [int(v) for v in args]
+                a, b = vals[:2] if vals else (0, 255)
+                c, d = vals[2:] if len(vals) == 4 else (None, None)
+                ops.append(("stretch", a, b, c, d))
+            elif name == "quantize" and len(args) == 1:
+                ops.append(("quantize", int(args[0])))
+            elif name == "negative" and not args:
+                ops.append(("negative",))
+            elif name == "gamma" and len(args) == 1:
+                ops.append(("gamma", float(args[0])))
+            else:
+                raise ValueError
+        except ValueError:
+            raise ValueError(f"Operação inválida: {item!r} "
+                             "(use equalize[:L], stretch[:a:b[:c:d]], quantize:L, negative, gamma:g)") from None
+    if not ops:
+        raise ValueError("Nenhuma operação informada.")
+    return ops
+
+def _op_lut(op: tuple, h: np.ndarray) -> np.ndarray:
+    """LUT de uma operação; h é o histograma da imagem nesse ponto da cadeia."""
+    name = op[0]
+    if name == "equalize":
+        return equalize_lut(h, L=op[1])
+    if name == "stretch":
+        _, a, b, c, d = op
+        nz = np.flatnonzero(h)
+        if c is None: c = int(nz[0]) if nz.size else 0
+        if d is None: d = int(nz[-1]) if nz.size else 0
+        return stretch_lut(a, b, c, d)
+    if name == "quantize":
+        return quantize_lut(op[1])
+    if name == "negative":
+        return negative_lut()
+    if name == "gamma":
+        return gamma_lut(op[1])
+    raise ValueError(f"Operação desconhecida: {name!r}")
+
+def chain_lut(h: np.ndarray, ops: list[tuple] | str) -> np.ndarray:
+    """
+    Compõe a cadeia em uma única LUT. Operações que dependem do histograma
+    (equalize, stretch automático) usam o histograma da etapa anterior,
+    obtido dobrando o histograma original pela LUT acumulada (O(256)).
+    """
+    if isinstance(ops, str):
+        ops = parse_lut_ops(ops)
+    lut = identity_lut()
+    for op in ops:
+        lut = _op_lut(op, _fold_hist(h, lut))[lut]
+    return lut
+
+def apply_chain(img: np.ndarray, ops: list[tuple] | str) -> tuple[np.ndarray, np.ndarray]:
+    """Aplica a cadeia de operações pontuais com um único gather. Retorna (out, lut)."""
+    if img.dtype != np.uint8:
+        img = ensure_u8(img)
+    lut = chain_lut(_hist256(img), ops)
+    return apply_lut(img, lut), lut
 
 def histogram(img: np.ndarray, L: int = 256) -> np.ndarray:
     """
     Histograma (contagens) para níveis 0..L-1.
-    Se L < 256, usa histograma dos ÍNDICES quantizados (0..L-1).
+    Se L for menor que os níveis da imagem (256 em uint8, 65536 em uint16),
+    usa histograma dos ÍNDICES quantizados (0..L-1).
     """
-    if L < 256:
-        flat = _quantize_indices(img, L).ravel()
-    else:
-        flat = ensure_u8(img).ravel()
-    h = np.bincount(flat, minlength=L)
-    if h.shape[0] > L:
-        h = h[:L]
-    return h.astype(np.int64)
+    img = _native(img)
+    levels = _levels(img)
+    h = _hist(img, levels)
+    if L < levels:
+        h = _fold_hist(h, _quantize_indices(_level_range(levels), L, levels), L)
+    return h[:L] if L <= levels else np.pad(h, (0, L - levels))
 
 def histogram_normalized(h: np.ndarray) -> np.ndarray:
     n = h.sum()
@@ -50,61 +234,213 @@ def cdf_from_pdf(pdf: np.ndarray) -> np.ndarray:
 def equalization_lut(pdf: np.ndarray, L: int = 256) -> np.ndarray:
     cdf = cdf_from_pdf(pdf)
     lut = np.round((L - 1) * cdf)
-    lut = np.clip(lut, 0, L - 1).astype(np.uint8)
+    lut = np.clip(lut, 0, L - 1).astype(np.uint8 if L <= 256 else np.uint16)
     return lut
 
 def apply_lut(img: np.ndarray, lut: np.ndarray) -> np.ndarray:
     """Transforma a imagem via look-up table (assume img já está no domínio da LUT)."""
-    return lut[img]
+    if lut.ndim != 1 or not img.flags.c_contiguous:
+        return lut[img]
+    flat = img.ravel()
+    out = np.empty(flat.shape, dtype=lut.dtype)
+    for i in range(0, flat.size, _CHUNK):
+        np.take(lut, flat[i:i + _CHUNK], out=out[i:i + _CHUNK])
+    return out.reshape(img.shape)
 
-def equalize(img: np.ndarray, L: int = 256):
+def equalize(img: np.ndarray, L: int | None = None, out_bits: int | None = None):
     """
     Equalização de histograma:
-      - Se L < 256: trabalha no domínio quantizado 0..L-1 e depois expande para 0..255.
-      - Se L = 256: opera direto em 0..255.
-    Retorna: (out, lut, h_in, pdf, cdf)
+      - L padrão: níveis da imagem (256 em uint8, 65536 em uint16);
+      - Se L for menor: trabalha no domínio quantizado 0..L-1 e depois expande.
+      - out_bits: profundidade da saída (8 ou 16); padrão = a da entrada.
+    A quantização, a LUT e a expansão viram uma única LUT (256 ou 65536
+    entradas), aplicada à imagem com um só gather.
+    Retorna: (out, lut, h_in, pdf, cdf) — lut, h_in, pdf e cdf no domínio 0..L-1.
     """
-    if img.dtype != np.uint8:
-        img = ensure_u8(img)
+    img = _native(img)
+    levels = _levels(img)
+    L = levels if L is None else int(L)
+    out_max = _out_max(img, out_bits)
 
     if L < 2:
         raise ValueError("L deve ser >= 2.")
+    if L > levels:
+        raise ValueError(f"L deve ser <= {levels} para imagens {img.dtype}.")
 
-    # 1) obter "níveis" onde o histograma será calculado
-    if L < 256:
-        idx = _quantize_indices(img, L)   # 0..L-1
-        h_in = histogram(idx, L=L)        # hist dos índices
-    else:
-        idx = img.copy()                  # 0..255
-        h_in = histogram(img, L=L)        # hist original
+    # 1) histograma nos "níveis" do domínio (índices quantizados se L < níveis)
+    h_in = histogram(img, L=L)
 
     # 2) pdf/cdf e LUT nesse domínio
     pdf = histogram_normalized(h_in)
     cdf = cdf_from_pdf(pdf)
     lut = equalization_lut(pdf, L=L)      # 0..L-1 -> 0..L-1
 
-    # 3) aplicar LUT nos índices
-    s_idx = apply_lut(idx, lut)           # 0..L-1
-
-    # 4) expandir para 0..255 se necessário
-    if L < 256:
-        out = _dequantize_to_255(s_idx, L)
+    # 3) LUT completa (níveis da entrada -> 0..out_max) e um único gather
+    if L < levels or out_max != L - 1:
+        q = _quantize_indices(_level_range(levels), L, levels) if L < levels else _level_range(levels)
+        full = _dequantize(lut[q], L, out_max)
     else:
-        out = s_idx.astype(np.uint8)
+        full = lut
+    out = apply_lut(img, full)
 
     return out, lut, h_in, pdf, cdf
 
-def contrast_stretch(img: np.ndarray, a: int = 0, b: int = 255,
-                     c: int | None = None, d: int | None = None) -> np.ndarray:
+def percentile_levels(h: np.ndarray, low: float = 1.0, high: float = 99.0) -> tuple[int, int]:
+    """
+    Níveis (c, d) dos percentis low/high (0..100) a partir do histograma, em O(L):
+      c = primeiro nível com CDF >  low% de N
+      d = primeiro nível com CDF >= high% de N
+    Com low=0 e high=100 resulta no mínimo e no máximo da imagem.
+    """
+    if not 0.0 <= low <= high <= 100.0:
+        raise ValueError("Percentis devem satisfazer 0 <= low <= high <= 100.")
+    cum = np.cumsum(h)
+    n = cum[-1]
+    if n == 0:
+        return 0, 0
+    top = int(np.searchsorted(cum, n, side="left"))          # maior nível presente
+    c = min(int(np.searchsorted(cum, low / 100.0 * n, side="right")), top)
+    d = min(int(np.searchsorted(cum, high / 100.0 * n, side="left")), top)
+    return c, max(c, d)
+
+def contrast_stretch(img: np.ndarray, a: int = 0, b: int | None = None,
+                     c: int | None = None, d: int | None = None,
+                     low: float | None = None, high: float | None = None,
+                     out_bits: int | None = None) -> np.ndarray:
+    """
+    Alargamento de contraste [c,d] -> [a,b] aplicado como LUT.
+    c/d padrão: mín./máx.; com low/high (percentis 0..100) vêm do histograma
+    acumulado, ignorando pixels extremos isolados. c/d explícitos têm prioridade.
+    uint16: LUT de 65536 entradas. out_bits (8 ou 16) escolhe a profundidade
+    da saída; b=None usa o máximo dela (255 ou 65535).
+    """
+    img = _native(img)
+    levels = _levels(img)
+    out_max = _out_max(img, out_bits)
+    if b is None: b = out_max
+
+    if low is not None or high is not None:
+        pc, pd = percentile_levels(_hist(img, levels), 0.0 if low is None else low,
+                                   100.0 if high is None else high)
+        if c is None: c = pc
+        if d is None: d = pd
+    if c is None: c = int(img.min())
+    if d is None: d = int(img.max())
+
+    return apply_lut(img, stretch_lut(a, b, c, d, levels=levels, out_max=out_max))
+
+# =========================
+# Histograma acumulável (imagens grandes e coleções)
+# =========================
+class HistogramAccumulator:
+    """
+    Histograma acumulado por partes (256 bins; 65536 para dados de 16 bits):
+    - add(chunk): soma um bloco de linhas ou uma imagem inteira;
+    - merge(outro): junta acumuladores (ex.: vindos de outros processos);
+    - pdf()/lut(): alimentam equalization_lut / equalize_lut direto.
+    """
+
+    def __init__(self, bins: int = 256):
+        self.bins = int(bins)
+        self.counts = np.zeros(self.bins, dtype=np.int64)
+
+    @property
+    def n(self) -> int:
+        return int(self.counts.sum())
+
+    def add(self, chunk: np.ndarray) -> "HistogramAccumulator":
+        chunk = _native(chunk)
+        if _levels(chunk) > self.bins:
+            raise ValueError(f"Dados {chunk.dtype} precisam de HistogramAccumulator(bins={_levels(chunk)}).")
+        self.counts += np.bincount(chunk.ravel(), minlength=self.bins)[:self.bins]
+        return self
+
+    def add_rows(self, arr: np.ndarray, rows: int = 4096) -> "HistogramAccumulator":
+        """Acumula um array grande (ex.: memmap) em faixas de linhas, sem carregá-lo inteiro."""
+        for r0 in range(0, arr.shape[0], rows):
+            self.add(np.asarray(arr[r0:r0 + rows]))
+        return self
+
+    def merge(self, other: "HistogramAccumulator") -> "HistogramAccumulator":
+        if other.bins != self.bins:
+            raise ValueError("Acumuladores com número de bins diferente.")
+        self.counts += other.counts
+        return self
+
+    def pdf(self) -> np.ndarray:
+        return histogram_normalized(self.counts)
+
+    def lut(self, L: int | None = None) -> np.ndarray:
+        """LUT de equalização (0..bins-1 -> 0..bins-1) do histograma acumulado."""
+        return equalize_lut(self.counts, L=L)
+
+# =========================
+# CLAHE (equalização adaptativa com limite de contraste)
+# =========================
+def _tile_axis(n: int, tiles: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Para um eixo de n pixels dividido em `tiles` blocos:
+    - tile: bloco de cada pixel (para os histogramas);
+    - i0, i1, w: blocos vizinhos e peso para a interpolação entre os centros.
+    """
+    pos = np.arange(n)
+    tile = (pos * tiles) // n
+    f = (pos + 0.5) * tiles / n - 0.5           # posição em unidades de bloco (centros em 0..tiles-1)
+    i0 = np.clip(np.floor(f), 0, tiles - 1).astype(np.intp)
+    i1 = np.minimum(i0 + 1, tiles - 1)
+    w = np.clip(f - i0, 0.0, 1.0).astype(np.float32)
+    return tile, i0, i1, w
+
+def clahe_luts(img: np.ndarray, grid: tuple[int, int] = (8, 8), clip: float = 2.0) -> np.ndarray:
+    """
+    LUTs (gy*gx, 256) float32 de todos os blocos de uma vez:
+    - um único np.bincount sobre índices (bloco*256 + nível);
+    - corte em clip * (média de pixels por nível) e redistribuição uniforme do excesso;
+    - LUT = round(255 * CDF) de cada bloco.
+    clip <= 0 desliga o corte (equalização local pura).
+    """
+    gy, gx = grid
+    h, w = img.shape[:2]
+    ty, _, _, _ = _tile_axis(h, gy)
+    tx, _, _, _ = _tile_axis(w, gx)
+
+    idx = (ty[:, None] * gx + tx[None, :]).astype(np.intp) * 256 + img
+    hist = np.bincount(idx.ravel(), minlength=gy * gx * 256).reshape(gy * gx, 256).astype(np.float64)
+
+    area = hist.sum(axis=1, keepdims=True)
+    if clip > 0:
+        limit = np.maximum(clip * area / 256.0, 1.0)
+        excess = np.maximum(hist - limit, 0.0).sum(axis=1, keepdims=True)
+        hist = np.minimum(hist, limit) + excess / 256.0
+
+    cdf = np.cumsum(hist, axis=1) / np.maximum(area, 1.0)
+    return np.clip(np.round(255.0 * cdf), 0, 255).astype(np.float32)
+
+def clahe(img: np.ndarray, grid: tuple[int, int] = (8, 8), clip: float = 2.0) -> np.ndarray:
+    """
+    CLAHE: equalização por blocos (grid = linhas x colunas de blocos) com
+    limite de contraste `clip`. Cada pixel mistura bilinearmente as LUTs dos
+    quatro blocos vizinhos (centros), sem laço por pixel. Retorna uint8.
+    """
     if img.dtype != np.uint8:
         img = ensure_u8(img)
+    gy, gx = (int(grid[0]), int(grid[1]))
+    if gy < 1 or gx < 1:
+        raise ValueError("grid deve ter ao menos 1x1 blocos.")
+    h, w = img.shape[:2]
+    gy, gx = min(gy, h), min(gx, w)
 
-    F = img.astype(np.float32)
-    if c is None: c = int(F.min())
-    if d is None: d = int(F.max())
+    luts = clahe_luts(img, (gy, gx), clip).ravel()
+    _, y0, y1, wy = _tile_axis(h, gy)
+    _, x0, x1, wx = _tile_axis(w, gx)
+    wy = wy[:, None]
+    wx = wx[None, :]
 
-    if d == c:
-        return np.full_like(img, fill_value=a, dtype=np.uint8)
+    v = img.astype(np.intp)
+    def lut_at(iy, ix):
+        return luts[(iy[:, None] * gx + ix[None, :]) * 256 + v]
 
-    G = (F - c) * ((b - a) / float(d - c)) + a
-    return ensure_u8(G)
+    top = lut_at(y0, x0) * (1 - wx) + lut_at(y0, x1) * wx
+    bottom = lut_at(y1, x0) * (1 - wx) + lut_at(y1, x1) * wx
+    out = top * (1 - wy) + bottom * wy
+    return ensure_u8(np.round(out))
@@ -0,0 +1,89 @@
+"""
+Histograma de uma coleção inteira de imagens (ex.: dezenas de milhares).
+
+Os arquivos são divididos em lotes e cada lote vira um HistogramAccumulator em
+um processo separado (decodificação em paralelo); os acumuladores parciais
+são juntados com merge(). Arquivos .npy são lidos como memmap, em faixas de
+linhas, sem carregar o array inteiro.
+
+Imagens de 16 bits são lidas sem perda: basta um arquivo uint16 para o
+histograma da coleção ter 65536 bins (os valores são contados como estão,
+então dados de 8 bits ficam em 0..255).
+"""
+
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+
+from src.trabalhos.t01_interpolacao.io_utils import load_gray, open_array
+from .algorithms import HistogramAccumulator
+
+IMG_SUFFIXES = {".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".npy"}
+
+def list_images(pasta: str | Path, recursivo: bool = False) -> list[Path]:
+    """Arquivos de imagem da pasta, em ordem alfabética."""
+    pasta = Path(pasta)
+    if not pasta.is_dir():
+        raise FileNotFoundError(f"Pasta não encontrada: {pasta}")
+    it = pasta.rglob("*") if recursivo else pasta.iterdir()
+    return sorted(p for p in it if p.is_file() and p.suffix.lower() in IMG_SUFFIXES)
+
+def _bins(arr: np.ndarray) -> int:
+    """Bins necessários para os dados: 65536 (uint16) ou 256."""
+    return 65536 if arr.dtype == np.uint16 else 256
+
+def _widen(acc: HistogramAccumulator, bins: int) -> HistogramAccumulator:
+    """O mesmo histograma com `bins` bins (os níveis novos ficam com 0)."""
+    if acc.bins >= bins:
+        return acc
+    wide = HistogramAccumulator(bins)
+    wide.counts[:acc.bins] = acc.counts
+    return wide
+
+def _read(p: Path) -> np.ndarray:
+    """.npy como memmap; imagens em tons de cinza de 8/16 bits (uma decodificação)."""
+    if p.suffix.lower() == ".npy":
+        return open_array(p)
+    return load_gray(p)
+
+def _hist_files(paths: list[Path]) -> np.ndarray:
+    """Histograma de um lote de arquivos (executado no processo de trabalho)."""
+    acc = HistogramAccumulator()
+    for p in paths:
+        arr = _read(p)
+        acc = _widen(acc, _bins(arr))
+        if p.suffix.lower() == ".npy":
+            acc.add_rows(arr)
+        else:
+            acc.add(arr)
+    return acc.counts
+
+def corpus_histogram(paths: list[str | Path], workers: int | None = None,
+                     lote: int = 32) -> HistogramAccumulator:
+    """
+    Histograma acumulado de todos os arquivos.
+    workers: processos (None = número de CPUs; 0 ou 1 = no processo atual)
+    lote: arquivos por tarefa (amortiza a troca de mensagens entre processos)
+    Os lotes podem vir com 256 ou 65536 bins; o total usa o maior.
+    """
+    paths = [Path(p) for p in paths]
+    batches = [paths[i:i + lote] for i in range(0, len(paths), max(1, lote))]
+    total = HistogramAccumulator()
+
+    def juntar(counts: np.ndarray) -> None:
+        nonlocal total
+        part = HistogramAccumulator(len(counts))
+        part.counts = counts
+        total = _widen(total, part.bins)
+        total.merge(_widen(part, total.bins))
+
+    if workers is not None and workers <= 1:
+        for batch in batches:
+            juntar(_hist_files(batch))
+        return total
+
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        for counts in ex.map(_hist_files, batches):
+            juntar(counts)
+    return total
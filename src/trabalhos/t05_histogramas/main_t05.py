@@ -6,8 +6,9 @@ import numpy as np
 import matplotlib.pyplot as plt
 
 # Reutiliza IO do T01 (grayscale)
-from src.trabalhos.t01_interpolacao.io_utils import load_image, save_image
-from .algorithms import equalize, contrast_stretch, histogram
+from src.trabalhos.t01_interpolacao.io_utils import load_image, load_gray, save_image
+from .algorithms import equalize, contrast_stretch, histogram, apply_chain, parse_lut_ops, clahe, apply_lut
+from .corpus import list_images, corpus_histogram
 
 # ---------- Utilidades ----------
 def _stamp() -> str:
@@ -26,6 +27,16 @@ def _ask(prompt: str, default: str | None = None) -> str:
     s = input(f"{prompt}{f' [{default}]' if default is not None else ''}: ").strip()
     return s if s else (default or "")
 
+def _load(imagem: str, bits: int = 8) -> np.ndarray:
+    """
+    bits=8: tons de cinza uint8 (como antes).
+    bits=16: mantém dados de 16 bits (uint16) como decodificados; imagens
+    coloridas ou de 8 bits seguem em uint8.
+    """
+    if bits == 16:
+        return load_gray(imagem)
+    return load_image(imagem)
+
 def _plot_hist(ax, img: np.ndarray, L: int = 256, title: str = "Histograma"):
     h = histogram(img, L=L)
     ax.bar(np.arange(L), h, width=1.0)
@@ -51,27 +62,39 @@ def _show_pair_with_hist(title_l: str, img_l: np.ndarray,
         print(f"(Aviso) Não foi possível exibir as figuras: {e}")
 
 # ---------- Runs ----------
-def run_equalizacao(imagem: str, L: int = 256, out: str | None = None, visualizar: bool = True) -> Path:
-    img = load_image(imagem)
-    out_img, lut, h_in, pdf, cdf = equalize(img, L=L)
+def run_equalizacao(imagem: str, L: int | None = None, out: str | None = None, visualizar: bool = True,
+                    bits: int = 8, out_bits: int | None = None) -> Path:
+    """L=None usa todos os níveis da imagem (256 ou 65536 com bits=16)."""
+    img = _load(imagem, bits)
+    out_img, lut, h_in, pdf, cdf = equalize(img, L=L, out_bits=out_bits)
+    L = len(lut)
 
     base = Path(imagem).stem
-    out_path = Path(out) if out else _auto_out("t05_equalize", base, extra=f"L{L}")
+    extra = f"L{L}" + (f"_{out_img.dtype.itemsize * 8}bits" if out_img.dtype != np.uint8 else "")
+    out_path = Path(out) if out else _auto_out("t05_equalize", base, extra=extra)
     save_image(out_img, out_path)
     print(f"✅ [equalize] salvo em: {out_path}")
 
     if visualizar:
-        _show_pair_with_hist("Original", img, "Equalizada", out_img, L=L)
+        _show_pair_with_hist("Original", img, "Equalizada", out_img, L=min(L, 256))
     return out_path
 
-def run_stretch(imagem: str, a: int = 0, b: int = 255, c: int | None = None, d: int | None = None,
-                out: str | None = None, visualizar: bool = True) -> Path:
-    img = load_image(imagem)
-    out_img = contrast_stretch(img, a=a, b=b, c=c, d=d)
+def run_stretch(imagem: str, a: int = 0, b: int | None = None, c: int | None = None, d: int | None = None,
+                out: str | None = None, visualizar: bool = True,
+                low: float | None = None, high: float | None = None,
+                bits: int = 8, out_bits: int | None = None) -> Path:
+    """b=None usa o máximo da saída (255, ou 65535 com saída de 16 bits)."""
+    img = _load(imagem, bits)
+    if b is None:
+        b = (1 << (out_bits or (16 if img.dtype == np.uint16 else 8))) - 1
+    out_img = contrast_stretch(img, a=a, b=b, c=c, d=d, low=low, high=high, out_bits=out_bits)
 
     extra_parts = [f"a{a}", f"b{b}"]
     if c is not None: extra_parts.append(f"c{c}")
     if d is not None: extra_parts.append(f"d{d}")
+    if low is not None: extra_parts.append(f"low{low:g}")
+    if high is not None: extra_parts.append(f"high{high:g}")
+    if out_img.dtype != np.uint8: extra_parts.append(f"{out_img.dtype.itemsize * 8}bits")
     extra = "_".join(extra_parts)
 
     base = Path(imagem).stem
@@ -83,6 +106,81 @@ def run_stretch(imagem: str, a: int = 0, b: int = 255, c: int | None = None, d:
         _show_pair_with_hist("Original", img, "Contrast Stretching", out_img)
     return out_path
 
+def run_lut(imagem: str, ops: str, out: str | None = None, visualizar: bool = True) -> Path:
+    """
+    Cadeia de operações pontuais composta em uma única LUT de 256 entradas
+    e aplicada à imagem uma vez, ex.: "equalize,gamma:0.8,negative".
+    """
+    img = _load(imagem)
+    cadeia = parse_lut_ops(ops)
+    out_img, lut = apply_chain(img, cadeia)
+
+    extra = "_".join(op[0] + "".join(f"{v:g}" if isinstance(v, float) else str(v)
+                                     for v in op[1:] if v is not None) for op in cadeia)
+    base = Path(imagem).stem
+    out_path = Path(out) if out else _auto_out("t05_lut", base, extra=extra)
+    save_image(out_img, out_path)
+    print(f"✅ [lut {ops}] salvo em: {out_path}")
+
+    if visualizar:
+        _show_pair_with_hist("Original", img, f"LUT: {ops}", out_img)
+    return out_path
+
+def run_clahe(imagem: str, grid: tuple[int, int] = (8, 8), clip: float = 2.0,
+              out: str | None = None, visualizar: bool = True) -> Path:
+    """Equalização adaptativa por blocos (CLAHE) com limite de contraste."""
+    img = _load(imagem)
+    out_img = clahe(img, grid=grid, clip=clip)
+
+    base = Path(imagem).stem
+    out_path = Path(out) if out else _auto_out("t05_clahe", base, extra=f"g{grid[0]}x{grid[1]}_clip{clip:g}")
+    save_image(out_img, out_path)
+    print(f"✅ [clahe] salvo em: {out_path}")
+
+    if visualizar:
+        _show_pair_with_hist("Original", img, f"CLAHE {grid[0]}x{grid[1]}, clip={clip:g}", out_img)
+    return out_path
+
+def run_corpus(pasta: str, workers: int | None = None, recursivo: bool = False,
+               imagem: str | None = None, out: str | None = None, visualizar: bool = True) -> Path:
+    """
+    Histograma e LUT de equalização de uma coleção inteira (pool de processos).
+    Salva hist + lut em .npz; com `imagem`, aplica a LUT da coleção a ela,
+    lida na mesma profundidade da coleção (16 bits se houver arquivo uint16).
+    """
+    arquivos = list_images(pasta, recursivo=recursivo)
+    if not arquivos:
+        raise ValueError(f"Nenhuma imagem em {pasta}")
+    acc = corpus_histogram(arquivos, workers=workers)
+    lut = acc.lut()
+
+    base = Path(pasta).name or "corpus"
+    out_path = Path(out) if out else _auto_out("t05_corpus", base, extra=f"n{len(arquivos)}", suffix=".npz")
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez(out_path, hist=acc.counts, lut=lut)
+    print(f"✅ [corpus] {len(arquivos)} arquivos, {acc.n} pixels — hist/LUT salvos em: {out_path}")
+
+    if imagem:
+        img = _load(imagem, 16 if acc.bins > 256 else 8)
+        out_img = apply_lut(img, lut)
+        img_path = _auto_out("t05_corpus_eq", Path(imagem).stem, extra=base)
+        save_image(out_img, img_path)
+        print(f"✅ [corpus] LUT aplicada em: {img_path}")
+        if visualizar:
+            _show_pair_with_hist("Original", img, "Equalizada (LUT da coleção)", out_img)
+    elif visualizar:
+        try:
+            fig, ax = plt.subplots(figsize=(8, 3))
+            # 65536 bins são agrupados de 256 em 256 para o gráfico
+            ax.bar(np.arange(256), acc.counts.reshape(256, -1).sum(axis=1), width=1.0)
+            ax.set_title(f"Histograma da coleção ({len(arquivos)} imagens)")
+            ax.set_xlim(0, 255)
+            plt.tight_layout()
+            plt.show()
+        except Exception as e:
+            print(f"(Aviso) Não foi possível exibir as figuras: {e}")
+    return out_path
+
 # ---------- Questionário minimalista ----------
 def questionario():
     print("\n=== T05 — Processamento de Histogramas ===")
@@ -123,30 +221,91 @@ def _cli():
 
       # contrast stretching informando c/d
       python -m src.trabalhos.t05_histogramas.main_t05 stretch --imagem data/flor.png --a 0 --b 255 --c 30 --d 200
+
+      # contrast stretching por percentis (ignora pixels extremos isolados)
+      python -m src.trabalhos.t05_histogramas.main_t05 stretch --imagem data/flor.png --low 1 --high 99
+
+      # imagem de 16 bits: histograma/LUT de 65536 níveis, saída em 8 ou 16 bits
+      python -m src.trabalhos.t05_histogramas.main_t05 eq --imagem sensor16.png --bits 16 --out-bits 8
+
+      # cadeia de operações pontuais aplicada como uma única LUT
+      python -m src.trabalhos.t05_histogramas.main_t05 lut --imagem data/flor.png --ops equalize,gamma:0.8,negative
+
+      # CLAHE (grade de blocos 8x8, limite de contraste 2.0)
+      python -m src.trabalhos.t05_histogramas.main_t05 clahe --imagem data/flor.png --grid 8 8 --clip 2.0
+
+      # histograma/LUT de uma pasta inteira (pool de processos) aplicada a uma imagem
+      python -m src.trabalhos.t05_histogramas.main_t05 corpus --pasta data --workers 4 --imagem data/flor.png
     """
     p = argparse.ArgumentParser(description="T05 — Processamento de Histogramas (equalização e contrast stretching)")
     sub = p.add_subparsers(dest="cmd")
 
     peq = sub.add_parser("eq", help="Equalização de histograma (CDF/LUT)")
     peq.add_argument("--imagem", required=True)
-    peq.add_argument("--L", type=int, default=256)
+    peq.add_argument("--L", type=int, default=None,
+                     help="Níveis do domínio (padrão: todos — 256, ou 65536 com --bits 16)")
+    peq.add_argument("--bits", type=int, choices=[8, 16], default=8,
+                     help="Profundidade de leitura: 16 mantém dados de 16 bits")
+    peq.add_argument("--out-bits", type=int, choices=[8, 16], default=None,
+                     help="Profundidade da saída (padrão: a da entrada)")
     peq.add_argument("--out")
     peq.add_argument("--no-show", action="store_true", help="Não abrir janelas de visualização")
 
     pst = sub.add_parser("stretch", help="Alargamento de contraste")
     pst.add_argument("--imagem", required=True)
     pst.add_argument("--a", type=int, default=0)
-    pst.add_argument("--b", type=int, default=255)
+    pst.add_argument("--b", type=int, default=None, help="Máx. alvo (padrão: 255, ou 65535 com saída de 16 bits)")
     pst.add_argument("--c", type=int)
     pst.add_argument("--d", type=int)
+    pst.add_argument("--low", type=float, help="Percentil inferior para c (0..100), ex.: 1")
+    pst.add_argument("--high", type=float, help="Percentil superior para d (0..100), ex.: 99")
+    pst.add_argument("--bits", type=int, choices=[8, 16], default=8,
+                     help="Profundidade de leitura: 16 mantém dados de 16 bits")
+    pst.add_argument("--out-bits", type=int, choices=[8, 16], default=None,
+                     help="Profundidade da saída (padrão: a da entrada)")
     pst.add_argument("--out")
     pst.add_argument("--no-show", action="store_true")
 
+    plu = sub.add_parser("lut", help="Cadeia de operações pontuais composta em uma LUT")
+    plu.add_argument("--imagem", required=True)
+    plu.add_argument("--ops", required=True,
+                     help="equalize[:L], stretch[:a:b[:c:d]], quantize:L, negative, gamma:g (separadas por vírgula)")
+    plu.add_argument("--out")
+    plu.add_argument("--no-show", action="store_true")
+
+    pcl = sub.add_parser("clahe", help="Equalização adaptativa por blocos (CLAHE)")
+    pcl.add_argument("--imagem", required=True)
+    pcl.add_argument("--grid", type=int, nargs=2, default=[8, 8], metavar=("LINHAS", "COLUNAS"),
+                     help="Grade de blocos (padrão: 8 8)")
+    pcl.add_argument("--clip", type=float, default=2.0,
+                     help="Limite de contraste (múltiplo da média por nível; 0 desliga)")
+    pcl.add_argument("--out")
+    pcl.add_argument("--no-show", action="store_true")
+
+    pco = sub.add_parser("corpus", help="Histograma/LUT de equalização de uma coleção de imagens")
+    pco.add_argument("--pasta", required=True)
+    pco.add_argument("--workers", type=int, default=None, help="Processos (padrão: nº de CPUs; 1 = sem pool)")
+    pco.add_argument("--recursivo", action="store_true", help="Inclui subpastas")
+    pco.add_argument("--imagem", help="(Opcional) imagem para aplicar a LUT da coleção")
+    pco.add_argument("--out", help="(Opcional) caminho do .npz com hist e lut")
+    pco.add_argument("--no-show", action="store_true")
+
     args = p.parse_args()
     if args.cmd == "eq":
-        run_equalizacao(imagem=args.imagem, L=args.L, out=args.out, visualizar=not args.no_show)
+        run_equalizacao(imagem=args.imagem, L=args.L, out=args.out, visualizar=not args.no_show,
+                        bits=args.bits, out_bits=args.out_bits)
     elif args.cmd == "stretch":
-        run_stretch(imagem=args.imagem, a=args.a, b=args.b, c=args.c, d=args.d, out=args.out, visualizar=not args.no_show)
+        run_stretch(imagem=args.imagem, a=args.a, b=args.b, c=args.c, d=args.d, out=args.out,
+                    visualizar=not args.no_show, low=args.low, high=args.high,
+                    bits=args.bits, out_bits=args.out_bits)
+    elif args.cmd == "lut":
+        run_lut(imagem=args.imagem, ops=args.ops, out=args.out, visualizar=not args.no_show)
+    elif args.cmd == "clahe":
+        run_clahe(imagem=args.imagem, grid=tuple(args.grid), clip=args.clip, out=args.out,
+                  visualizar=not args.no_show)
+    elif args.cmd == "corpus":
+        run_corpus(pasta=args.pasta, workers=args.workers, recursivo=args.recursivo,
+                   imagem=args.imagem, out=args.out, visualizar=not args.no_show)
     else:
         # sem subcomando → questionário
         questionario()